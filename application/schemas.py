@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
+import base64
+import json
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator
 from typing import Optional, List
 from enum import Enum
+from functools import lru_cache
 
 
 class TaskStatus(str, Enum):
@@ -58,10 +61,178 @@ class TaskOut(BaseModel):
     status: TaskStatus
     priority: TaskPriority
     list_id: int
+    rank: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
 
+TASK_FIELDS = tuple(TaskOut.model_fields)
+
+
+def parse_task_fields(raw: str) -> tuple[str, ...]:
+    """
+    Parse a ``fields=`` query value into a canonical tuple of TaskOut fields.
+
+    ``id`` is always included so clients can identify the returned tasks.
+
+    Args:
+        raw (str): Comma separated field names, e.g. ``status,title``.
+
+    Returns:
+        tuple[str, ...]: Requested fields in TaskOut declaration order.
+
+    Raises:
+        ValueError: If a field is not part of TaskOut.
+    """
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown task fields: {', '.join(sorted(unknown))}. "
+            f"Allowed fields: {', '.join(TASK_FIELDS)}."
+        )
+    return tuple(name for name in TASK_FIELDS if name == "id" or name in requested)
+
+
+# Sort keys of a task list read. Each one is served by an index starting with
+# list_id (see TaskModel), so sorted pages never need a filesort; id breaks
+# ties and makes every order total, which keyset cursors rely on.
+TASK_SORT_KEYS = (
+    ("rank", "id"),
+    ("id",),
+    ("priority", "id"),
+    ("status", "priority", "id"),
+    ("status", "title", "id"),
+)
+TASK_SORT_FIELDS = ("id", "rank", "title", "status", "priority")
+
+
+def parse_task_sort(
+    raw: str, pinned: tuple[str, ...] = ()
+) -> tuple[tuple[str, ...], bool]:
+    """
+    Parse a ``sort=`` query value such as ``-priority`` or ``status,title``.
+
+    Columns pinned by an equality filter have a single value, so they are
+    dropped from the sort: ``status,title`` with ``status=pending`` is read
+    as ``title``. ``id`` is appended when missing.
+
+    Args:
+        raw (str): Comma separated fields, each optionally prefixed with
+        ``-`` for descending order. All fields share the same direction.
+        pinned (tuple[str, ...], optional): Fields filtered by equality.
+
+    Returns:
+        tuple[tuple[str, ...], bool]: The sort columns and whether the
+        order is descending.
+
+    Raises:
+        ValueError: If a field is unknown, the directions are mixed, or no
+        index serves the order.
+    """
+    terms = [term.strip() for term in raw.split(",") if term.strip()]
+    if not terms:
+        raise ValueError("The sort cannot be empty.")
+    names = [term.lstrip("-") for term in terms]
+    unknown = set(names).difference(TASK_SORT_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown sort fields: {', '.join(sorted(unknown))}. "
+            f"Allowed fields: {', '.join(TASK_SORT_FIELDS)}."
+        )
+    directions = {term.startswith("-") for term in terms}
+    if len(directions) > 1:
+        raise ValueError("All sort fields must use the same direction.")
+
+    columns = [name for name in dict.fromkeys(names) if name not in pinned]
+    if "id" in columns:
+        # Nothing after id changes the order
+        columns = columns[: columns.index("id")]
+    columns = (*columns, "id")
+    for key in TASK_SORT_KEYS:
+        offset = len(key) - len(columns)
+        if offset >= 0 and key[offset:] == columns and set(key[:offset]) <= set(pinned):
+            return columns, directions.pop()
+    raise ValueError(
+        f"Unsupported sort: {raw}. Supported sorts: "
+        f"{'; '.join(','.join(key) for key in TASK_SORT_KEYS)}, optionally "
+        "all descending and without the fields filtered by equality."
+    )
+
+
+# Valid type of each sort value in a cursor. Tasks created before ranks
+# existed have a NULL rank.
+TASK_CURSOR_VALUE_CHECKS = {
+    "id": lambda value: type(value) is int,
+    "rank": lambda value: value is None or isinstance(value, str),
+    "title": lambda value: isinstance(value, str),
+    "status": lambda value: value in [each.value for each in TaskStatus],
+    "priority": lambda value: value in [each.value for each in TaskPriority],
+}
+
+
+def encode_task_cursor(columns: tuple[str, ...], descending: bool, values: list) -> str:
+    """Opaque cursor pointing after the task whose sort values are ``values``."""
+    payload = {"sort": columns, "desc": descending, "after": values}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_task_cursor(raw: str, columns: tuple[str, ...], descending: bool) -> list:
+    """
+    Return the sort values stored in a cursor made by ``encode_task_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed, belongs to another sort or
+        holds a value of the wrong type.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+        matches = (
+            payload["sort"] == list(columns)
+            and payload["desc"] == descending
+            and len(payload["after"]) == len(columns)
+        )
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor.")
+    if not matches:
+        raise ValueError("The cursor belongs to another sort or filter.")
+    for name, value in zip(columns, payload["after"]):
+        if not TASK_CURSOR_VALUE_CHECKS[name](value):
+            raise ValueError(f"Invalid cursor value for {name}.")
+    return payload["after"]
+
+
+@lru_cache(maxsize=None)
+def task_fieldset_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build (once per field combination) a TaskOut restricted to ``fields``."""
+    return create_model(
+        "TaskFieldset",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (TaskOut.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@lru_cache(maxsize=None)
+def task_list_fieldset_response(fields: tuple[str, ...]) -> type[BaseModel]:
+    """TaskListFilteredResponse counterpart for a sparse fieldset."""
+    return create_model(
+        "TaskListFieldsetResponse",
+        tasks=(List[task_fieldset_model(fields)], ...),
+        completion=(str, ...),
+        next_cursor=(Optional[str], None),
+    )
+
+
+class TaskMove(BaseModel):
+    after_id: Optional[int] = Field(
+        default=None, description="Place the task right after this task."
+    )
+    before_id: Optional[int] = Field(
+        default=None, description="Place the task right before this task."
+    )
+
+
 class TaskListCreate(BaseModel):
     name: str
 
@@ -80,6 +251,59 @@ class TaskListOut(BaseModel):
 class TaskListFilteredResponse(BaseModel):
     tasks: List[TaskOut]
     completion: str
+    next_cursor: Optional[str] = None
+
+
+class TaskBatchRequest(BaseModel):
+    ids: List[int]
+
+
+class TaskBatchResponse(BaseModel):
+    tasks: List[TaskOut]
+    missing: List[int]
+
+
+class TaskListSummary(BaseModel):
+    id: int
+    name: str
+    total: int
+    by_status: dict[TaskStatus, int]
+    by_priority: dict[TaskPriority, int]
+    completion: str
+
+
+class TaskListSummaryPage(BaseModel):
+    lists: List[TaskListSummary]
+    next_after_id: Optional[int] = None
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: Optional[int]
+    created_at: float
+    duration_ms: float
+    profiled_ms: float
+
+
+class SingleFlightStats(BaseModel):
+    enabled: bool
+    leaders: int
+    followers: int
+    timeouts: int
+    errors: int
+    in_flight: int
+    coalescing_ratio: float
+
+
+class ArchiveRunResult(BaseModel):
+    archived: int
+
+
+class StatsRecountResult(BaseModel):
+    checked: int
+    repaired: int
 
 
 class UserCreate(BaseModel):
@@ -97,5 +321,9 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class TokenRevoke(BaseModel):
+    token: str
+
+
 class CreatedUser(BaseModel):
     message: str
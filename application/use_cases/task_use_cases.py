@@ -3,12 +3,21 @@ from application.schemas import (
     TaskCreate,
     TaskUpdate,
     TaskOut,
+    TaskBatchResponse,
     TaskListCreate,
     TaskListUpdate,
     TaskListOut,
+    TaskMove,
     TaskListFilteredResponse,
+    TaskListSummary,
+    TaskListSummaryPage,
+    encode_task_cursor,
+    task_fieldset_model,
+    task_list_fieldset_response,
 )
-from application.schemas import TaskStatus
+from application.schemas import TaskStatus, TaskPriority
+from pydantic import BaseModel
+from utils.tracing import traced
 
 
 class TaskListUseCase:
@@ -16,23 +25,84 @@ class TaskListUseCase:
         self.list_repo = list_repo
         self.task_repo = task_repo
 
+    @traced()
     def create_list(self, data: TaskListCreate) -> TaskListOut:
         new_list = self.list_repo.create_list(name=data.name)
         return TaskListOut.model_validate(new_list)
 
+    @traced()
     def update_list(self, list_id: int, data: TaskListUpdate) -> TaskListOut:
         task_list = self.list_repo.update_name_list(list_id, data)
         return TaskListOut.model_validate(task_list)
 
+    @traced()
     def get_list(self) -> list[TaskListOut]:
         return self.list_repo.get_all_lists()
 
+    @traced()
     def delete_list(self, list_id: int):
         self.list_repo.delete_list(list_id)
 
+    @traced()
+    def get_lists_summary(self, after_id: int, limit: int) -> TaskListSummaryPage:
+        """
+        Summarize a page of task lists: task counts by status and priority
+        and the completion percentage of each list.
+
+        Args:
+            after_id (int): Return lists whose ID is greater than this one.
+            limit (int): Maximum number of lists to return.
+
+        Returns:
+            TaskListSummaryPage: The summaries and the ``after_id`` to request
+            the next page with, or None on the last page.
+        """
+        summaries: dict[int, TaskListSummary] = {}
+        for (
+            list_id,
+            name,
+            task_status,
+            priority,
+            count,
+        ) in self.list_repo.get_lists_summary(after_id, limit):
+            summary = summaries.get(list_id)
+            if summary is None:
+                summary = summaries[list_id] = TaskListSummary(
+                    id=list_id,
+                    name=name,
+                    total=0,
+                    by_status={each_status: 0 for each_status in TaskStatus},
+                    by_priority={each_priority: 0 for each_priority in TaskPriority},
+                    completion="0%",
+                )
+            if not count:
+                continue
+            summary.total += count
+            summary.by_status[task_status] += count
+            summary.by_priority[priority] += count
+
+        for summary in summaries.values():
+            done = summary.by_status[TaskStatus.done]
+            percentage = int((done / summary.total) * 100) if summary.total else 0
+            summary.completion = f"{percentage}%"
+
+        lists = list(summaries.values())
+        next_after_id = lists[-1].id if len(lists) == limit else None
+        return TaskListSummaryPage(lists=lists, next_after_id=next_after_id)
+
+    @traced()
     def list_tasks_with_completion(
-        self, list_id: int, status: TaskStatus = None, priority=None
-    ) -> TaskListFilteredResponse:
+        self,
+        list_id: int,
+        status: TaskStatus = None,
+        priority=None,
+        fields: tuple[str, ...] = None,
+        include_archived: bool = False,
+        sort: tuple[str, ...] = ("rank", "id"),
+        descending: bool = False,
+        after: list = None,
+        limit: int = None,
+    ) -> TaskListFilteredResponse | BaseModel:
         """
         Get tasks from a given list, filtered by status and/or priority
         and returns them along with the completion percentage of the list.
@@ -43,24 +113,55 @@ class TaskListUseCase:
             Defaults to None.
             priority (TaskPriority, optional): Filter by task priority.
             Defaults to None.
+            fields (tuple[str, ...], optional): Sparse fieldset, as returned
+            by ``parse_task_fields``. Defaults to None (all fields).
+            include_archived (bool, optional): Also return archived tasks.
+            Defaults to False.
+            sort (tuple[str, ...], optional): Sort columns, as returned by
+            ``parse_task_sort``. Defaults to the rank order.
+            descending (bool, optional): Reverse the order. Defaults to False.
+            after (list, optional): Sort values decoded from a cursor; the
+            page starts after them. Defaults to None (first page).
+            limit (int, optional): Page size. Defaults to None (all tasks).
 
         Returns:
             TaskListFilteredResponse: A response containing the list of tasks
-            and the completion percentage.
+            and the completion percentage. With ``fields`` the tasks only
+            carry the requested fields. Archived tasks always count towards
+            the completion, even when they are not returned. ``next_cursor``
+            is set when a full page was returned.
         """
-        tasks = self.task_repo.get_tasks_by_list(list_id, status, priority)
-        total = len(tasks)
-        done = len(
-            [
-                each_task
-                for each_task in tasks
-                if each_task.status == TaskStatus.DONE.value
-            ]
+        tasks = self.task_repo.get_tasks_by_list(
+            list_id,
+            status,
+            priority,
+            fields,
+            include_archived,
+            sort=sort,
+            descending=descending,
+            after=after,
+            limit=limit,
         )
+        # Read from the per-list counters, whatever the size of the list
+        total, done = self.task_repo.count_tasks(list_id, status, priority)
         percentage = int((done / total) * 100) if total else 0
+
+        next_cursor = None
+        if limit is not None and len(tasks) == limit:
+            next_cursor = encode_task_cursor(
+                sort, descending, [getattr(tasks[-1], name) for name in sort]
+            )
+        if fields:
+            task_model = task_fieldset_model(fields)
+            return task_list_fieldset_response(fields)(
+                tasks=[task_model.model_validate(each_task) for each_task in tasks],
+                completion=f"{percentage}%",
+                next_cursor=next_cursor,
+            )
         return TaskListFilteredResponse(
             tasks=[TaskOut.model_validate(each_task) for each_task in tasks],
             completion=f"{percentage}%",
+            next_cursor=next_cursor,
         )
 
 
@@ -68,6 +169,7 @@ class TaskUseCase:
     def __init__(self, repo: TaskRepository):
         self.repo = repo
 
+    @traced()
     def create_task(self, list_id: int, data: TaskCreate) -> TaskOut:
         task = self.repo.create_task(
             list_id=list_id,
@@ -78,13 +180,51 @@ class TaskUseCase:
         )
         return TaskOut.model_validate(task)
 
+    @traced()
+    def get_tasks(
+        self, task_ids: list[int], include_archived: bool = False
+    ) -> TaskBatchResponse:
+        """
+        Resolve many tasks at once.
+
+        Args:
+            task_ids (list[int]): Requested IDs; duplicates are ignored.
+            include_archived (bool, optional): Also return archived tasks, so
+            only deleted ones are reported missing.
+
+        Returns:
+            TaskBatchResponse: Found tasks in request order and the IDs
+            that do not exist.
+        """
+        unique_ids = list(dict.fromkeys(task_ids))
+        found = {
+            task.id: task
+            for task in self.repo.get_tasks_by_ids(unique_ids, include_archived)
+        }
+        return TaskBatchResponse(
+            tasks=[
+                TaskOut.model_validate(found[task_id])
+                for task_id in unique_ids
+                if task_id in found
+            ],
+            missing=[task_id for task_id in unique_ids if task_id not in found],
+        )
+
+    @traced()
     def update_task(self, task_id: int, data: TaskUpdate) -> TaskOut:
         renewed_task = self.repo.update_task(task_id, data)
         return TaskOut.model_validate(renewed_task)
 
+    @traced()
     def delete_task(self, task_id: int):
         self.repo.delete_task(task_id)
 
+    @traced()
     def change_status(self, task_id: int, new_status: TaskStatus) -> TaskOut:
         task = self.repo.update_task_status(task_id, new_status)
         return TaskOut.model_validate(task)
+
+    @traced()
+    def move_task(self, task_id: int, data: TaskMove) -> TaskOut:
+        task = self.repo.move_task(task_id, data.after_id, data.before_id)
+        return TaskOut.model_validate(task)
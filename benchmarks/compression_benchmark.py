@@ -0,0 +1,98 @@
+"""
+CPU vs. bytes trade-off of the response encodings at each level.
+
+The payload mimics ``GET /tasklists/{list_id}/tasks`` for a large list.
+Both the buffered path (one ``finish`` call) and the streaming path (one
+flushed ``compress`` call per chunk, as done for the event stream) are
+measured.
+
+Run from the project root:
+
+    python -m benchmarks.compression_benchmark --tasks 20000
+"""
+
+import argparse
+import json
+import time
+from infrastructure.api.compression import (
+    BrotliCompressor,
+    GzipCompressor,
+    ZstdCompressor,
+    brotli,
+    zstandard,
+)
+
+LEVELS = {
+    "gzip": (GzipCompressor, range(1, 10)),
+    "br": (BrotliCompressor, range(0, 12)) if brotli else None,
+    "zstd": (ZstdCompressor, (1, 3, 6, 9, 12, 19)) if zstandard else None,
+}
+
+
+def build_payload(task_count: int) -> bytes:
+    statuses = ("pending", "in_progress", "done")
+    priorities = ("low", "medium", "high")
+    tasks = [
+        {
+            "id": task_id,
+            "title": f"Task {task_id}",
+            "description": f"Description of task number {task_id}",
+            "status": statuses[task_id % 3],
+            "priority": priorities[task_id % 3],
+            "list_id": 1,
+        }
+        for task_id in range(1, task_count + 1)
+    ]
+    return json.dumps({"tasks": tasks, "completion": "33%"}).encode()
+
+
+def measure(factory, level: int, payload: bytes, chunk_size: int, repeat: int):
+    buffered, streamed = float("inf"), float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        buffered_size = len(factory(level).finish(payload))
+        buffered = min(buffered, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        compressor = factory(level)
+        streamed_size = sum(
+            len(compressor.compress(payload[offset : offset + chunk_size]))
+            for offset in range(0, len(payload), chunk_size)
+        )
+        streamed_size += len(compressor.finish())
+        streamed = min(streamed, time.perf_counter() - start)
+    return buffered_size, buffered, streamed_size, streamed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = build_payload(args.tasks)
+    print(f"payload: {len(payload):,} bytes ({args.tasks} tasks)")
+    print(
+        f"{'encoding':<8} {'level':>5} {'bytes':>12} {'ratio':>7} {'ms':>9} "
+        f"{'MB/s':>8} {'stream bytes':>13} {'stream ms':>10}"
+    )
+    for encoding, entry in LEVELS.items():
+        if entry is None:
+            print(f"{encoding:<8} not installed")
+            continue
+        factory, levels = entry
+        for level in levels:
+            size, seconds, stream_size, stream_seconds = measure(
+                factory, level, payload, args.chunk_size, args.repeat
+            )
+            throughput = len(payload) / seconds / 1_000_000
+            print(
+                f"{encoding:<8} {level:>5} {size:>12,} {len(payload) / size:>7.1f} "
+                f"{seconds * 1000:>9.2f} {throughput:>8.1f} {stream_size:>13,} "
+                f"{stream_seconds * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-request cost of the token revocation check.
+
+Compares decoding an access token alone with the full ``get_current_user``
+check, and times the cache lookup on its own, for caches of various sizes.
+The token checked is not revoked, which is the path taken by almost every
+request.
+
+Run from the project root:
+
+    python -m benchmarks.revocation_benchmark --sizes 0 1000 100000
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from utils.jwt_handler import (  # noqa: E402
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+)
+from utils.revocation import revocation_cache  # noqa: E402
+
+
+def best_of(func, iterations: int, repeat: int) -> float:
+    """Best time of one call in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 100000])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    token = create_access_token({"sub": "benchmark"})
+    jti = decode_access_token(token)["jti"]
+    expires_at = time.time() + 3600
+    print(f"{'revoked':>9} {'decode ns':>10} {'user ns':>10} {'lookup ns':>10}")
+    for size in args.sizes:
+        revocation_cache._revoked = {uuid.uuid4().hex: expires_at for _ in range(size)}
+        decode = best_of(
+            lambda: decode_access_token(token), args.iterations, args.repeat
+        )
+        # The traced wrapper is included: it is part of the real dependency
+        user = best_of(lambda: get_current_user(token), args.iterations, args.repeat)
+        lookup = best_of(
+            lambda: revocation_cache.is_revoked(jti), args.iterations, args.repeat
+        )
+        print(f"{size:>9,} {decode:>10.0f} {user:>10.0f} {lookup:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.orm import Session
+from application.schemas import (
+    ArchiveRunResult,
+    ProfileSummary,
+    SingleFlightStats,
+    StatsRecountResult,
+    TokenRevoke,
+)
+from infrastructure.db import task_list_stats, token_repository
+from infrastructure.db.database import get_db
+from infrastructure.db.task_archiver import task_archiver
+from utils.jwt_handler import get_current_admin, get_revocable_claims
+from utils.profiler import ProfiledRoute, profile_store
+from utils.single_flight import read_single_flight
+from utils.tracing import traced
+
+router_admin = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+@router_admin.get("/profiles", response_model=list[ProfileSummary])
+@traced()
+def list_profiles():
+    """
+    List the stored request profiles, newest first.
+
+    Returns:
+        list[ProfileSummary]: Metadata of every profile in the ring buffer.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (401): If the user is not authenticated.
+        HTTPException (403): If the user is not an admin.
+    """
+    return profile_store.summaries()
+
+
+@router_admin.get("/profiles/{profile_id}")
+@traced()
+def download_profile(profile_id: str):
+    """
+    Download a profile: metadata, the top functions by time and the
+    collapsed stacks.
+
+    Args:
+        profile_id (str): ID returned in the ``X-Profile-Id`` header.
+
+    Returns:
+        FileResponse: The profile as a JSON attachment.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (404): If the profile does not exist or was evicted.
+    """
+    return FileResponse(
+        profile_store.path(profile_id),
+        media_type="application/json",
+        filename=f"profile-{profile_id}.json",
+    )
+
+
+@router_admin.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+@traced()
+def download_profile_collapsed(profile_id: str):
+    """
+    Download the collapsed stacks of a profile, ready for ``flamegraph.pl``
+    or speedscope.
+
+    Args:
+        profile_id (str): ID returned in the ``X-Profile-Id`` header.
+
+    Returns:
+        PlainTextResponse: One ``frame;frame;frame count`` line per stack.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (404): If the profile does not exist or was evicted.
+    """
+    return PlainTextResponse(profile_store.get(profile_id)["collapsed"])
+
+
+@router_admin.get("/metrics/single-flight", response_model=SingleFlightStats)
+@traced()
+def single_flight_metrics():
+    """
+    Counters of the read request coalescing since the process started.
+
+    Returns:
+        SingleFlightStats: Leader and follower counts, followers that timed
+        out or got the leader's error, and ``coalescing_ratio``, the share of
+        requests answered by another request's query.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (401): If the user is not authenticated.
+        HTTPException (403): If the user is not an admin.
+    """
+    return read_single_flight.stats()
+
+
+@router_admin.post("/archive/run", response_model=ArchiveRunResult)
+@traced()
+def run_task_archiver():
+    """
+    Archive the old done tasks now instead of waiting for the next
+    background pass. Works even when ``TASK_ARCHIVE_ENABLED`` is off.
+
+    Returns:
+        ArchiveRunResult: Number of tasks moved to the archive table.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (401): If the user is not authenticated.
+        HTTPException (403): If the user is not an admin.
+    """
+    archived = task_archiver.run_once()
+    read_single_flight.invalidate()
+    return {"archived": archived}
+
+
+@router_admin.post("/tokens/revoke")
+@traced()
+def revoke_token(body: TokenRevoke, db: Session = Depends(get_db)):
+    """
+    Revoke an access token before it expires. Other processes stop
+    accepting it after their next revocation refresh.
+
+    Args:
+        body (TokenRevoke): The token to revoke.
+        db (Session): Database session (Dependency injection).
+
+    Returns:
+        dict: Confirmation message.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (400): If the token is invalid, expired or has no ID.
+        HTTPException (401): If the user is not authenticated.
+        HTTPException (403): If the user is not an admin.
+    """
+    jti, expires_at = get_revocable_claims(body.token)
+    token_repository.revoke_token(db, jti, expires_at)
+    return {"message": "Token revoked"}
+
+
+@router_admin.post("/stats/recount", response_model=StatsRecountResult)
+@traced()
+def recount_task_list_stats(
+    list_id: Optional[int] = Query(None, description="Only recount this list."),
+    db: Session = Depends(get_db),
+):
+    """
+    Rebuild the per-list task counters from the tasks, fixing any drift.
+
+    Args:
+        list_id (int, optional): List to recount. Defaults to None (every
+        list, one transaction per list).
+        db (Session): Database session (Dependency injection).
+
+    Returns:
+        StatsRecountResult: Lists checked and lists whose counters were
+        wrong or missing.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (401): If the user is not authenticated.
+        HTTPException (403): If the user is not an admin.
+        HTTPException (404): If ``list_id`` does not exist.
+    """
+    if list_id is None:
+        checked, repaired = task_list_stats.recount_all(db)
+    else:
+        repaired = task_list_stats.recount_list(db, list_id)
+        if repaired is None:
+            raise HTTPException(
+                status_code=404, detail=f"List with ID {list_id} not found"
+            )
+        checked = 1
+    read_single_flight.invalidate()
+    return {"checked": checked, "repaired": repaired}
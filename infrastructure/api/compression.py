@@ -0,0 +1,206 @@
+import os
+import zlib
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "text/",
+)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it now."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Ordered by server preference, used to break ties between equal q-values
+COMPRESSORS = {
+    "zstd": (ZstdCompressor, COMPRESSION_ZSTD_LEVEL) if zstandard else None,
+    "br": (BrotliCompressor, COMPRESSION_BROTLI_QUALITY) if brotli else None,
+    "gzip": (GzipCompressor, COMPRESSION_GZIP_LEVEL),
+}
+AVAILABLE_ENCODINGS = [name for name, entry in COMPRESSORS.items() if entry]
+
+
+def negotiate_encoding(
+    accept_encoding: str, available: list[str] = AVAILABLE_ENCODINGS
+) -> str | None:
+    """
+    Pick the content coding to use from an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding (str): Raw header value, e.g. ``gzip, br;q=0.8``.
+        available (list[str]): Server supported codings, most preferred first.
+
+    Returns:
+        str | None: The chosen coding, or None to send the body as is.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for name in available:
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best coding the client accepts.
+
+    Buffered responses below ``minimum_size`` are sent as is. Streaming
+    responses (e.g. the task event stream) are compressed chunk by chunk
+    and flushed after each one so events are not held back.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.initial_message: Message = {}
+        self.started = False
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            await self._start(body, more_body)
+            return
+
+        if self.compressor is None:
+            await self._send(message)
+        elif more_body:
+            await self._send_body(self.compressor.compress(body), more_body=True)
+        else:
+            await self._send_body(self.compressor.finish(body), more_body=False)
+
+    async def _start(self, body: bytes, more_body: bool) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        content_type = headers.get("content-type", "")
+        if "content-encoding" in headers or not content_type.startswith(
+            COMPRESSIBLE_CONTENT_TYPES
+        ):
+            await self._send(self.initial_message)
+            await self._send_body(body, more_body)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(body) < self.minimum_size:
+            await self._send(self.initial_message)
+            await self._send_body(body, more_body)
+            return
+
+        factory, level = COMPRESSORS[self.encoding]
+        self.compressor = factory(level)
+        headers["Content-Encoding"] = self.encoding
+        if more_body:
+            del headers["Content-Length"]
+            body = self.compressor.compress(body)
+        else:
+            body = self.compressor.finish(body)
+            headers["Content-Length"] = str(len(body))
+
+        await self._send(self.initial_message)
+        await self._send_body(body, more_body)
+
+    async def _send_body(self, body: bytes, more_body: bool) -> None:
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
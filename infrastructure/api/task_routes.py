@@ -1,25 +1,88 @@
-from fastapi import APIRouter, Depends
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Optional
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from fastapi.encoders import jsonable_encoder
 from utils.jwt_handler import get_current_user
-from infrastructure.db.repositories import TaskRepository, TaskListRepository
+from utils.single_flight import read_single_flight
+from utils.tracing import traced
+from utils.profiler import ProfiledRoute
+from infrastructure.events.task_event_broker import (
+    task_event_broker,
+    EVENTS_HEARTBEAT_SECONDS,
+)
+from infrastructure.db.repositories import (
+    TASK_RANK_REBALANCE_LENGTH,
+    TaskRepository,
+    TaskListRepository,
+)
 from application.use_cases.task_use_cases import TaskUseCase, TaskListUseCase
 from application.schemas import (
     TaskCreate,
     TaskUpdate,
     TaskOut,
+    TaskBatchRequest,
+    TaskBatchResponse,
     TaskListCreate,
     TaskListUpdate,
     TaskListOut,
     TaskListFilteredResponse,
+    TaskListSummaryPage,
+    TaskMove,
     TaskStatus,
+    decode_task_cursor,
+    parse_task_fields,
+    parse_task_sort,
+    task_list_fieldset_response,
 )
-from infrastructure.db.database import get_db
+from infrastructure.db.database import SessionLocal, get_db
+
+router = APIRouter(prefix="/tasklists", tags=["Tareas"], route_class=ProfiledRoute)
+
+# Every authenticated user may read every list, so all callers share one
+# authorization scope. It is part of the single-flight key so that per-user
+# access rules only need to change it here.
+READ_SCOPE = "authenticated"
+
+
+@lru_cache
+def _type_adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
 
-router = APIRouter(prefix="/tasklists", tags=["Tareas"])
+
+def _coalesced_json(key: tuple, load: Callable[[], Any], response_model) -> Response:
+    """
+    Serve ``load()`` serialized as ``response_model``. Identical concurrent
+    requests share a single query and serialization.
+    """
+    adapter = _type_adapter(response_model)
+    body = read_single_flight.do((READ_SCOPE, *key), lambda: adapter.dump_json(load()))
+    return Response(content=body, media_type="application/json")
+
+
+def _rebalance_task_list(list_id: int):
+    db = SessionLocal()
+    try:
+        TaskRepository(db).rebalance_list(list_id)
+    finally:
+        db.close()
 
 
 @router.post("/", response_model=TaskListOut)
+@traced()
 def create_task_list(
     data: TaskListCreate,
     db: Session = Depends(get_db),
@@ -39,10 +102,13 @@ def create_task_list(
         TaskListRepository(db),
         TaskRepository(db),
     )
-    return use_case.create_list(data)
+    task_list = use_case.create_list(data)
+    read_single_flight.invalidate()
+    return task_list
 
 
 @router.get("/get_all", response_model=list[TaskListOut])
+@traced()
 def get_task_list(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
@@ -63,10 +129,45 @@ def get_task_list(
     """
 
     use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
-    return jsonable_encoder(use_case.get_list())
+    return _coalesced_json(("get_all",), use_case.get_list, list[TaskListOut])
+
+
+@router.get("/summary", response_model=TaskListSummaryPage)
+@traced()
+def get_task_lists_summary(
+    after_id: int = Query(0, ge=0, description="Last list ID of the previous page."),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieve a page of task lists with their task counts by status and
+    priority and their completion percentage, computed in a single query.
+
+    Args:
+        after_id (int, optional): Return lists after this ID. Defaults to 0.
+        limit (int, optional): Page size, between 1 and 1000. Defaults to 100.
+        db (Session): Database session (Dependency injection).
+        current_user (dict): Authenticated user (Dependency injection).
+
+    Returns:
+        TaskListSummaryPage: The list summaries and ``next_after_id`` to pass
+        as ``after_id`` for the next page (null on the last page).
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (500): If there is an internal server error.
+    """
+    use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
+    return _coalesced_json(
+        ("summary", after_id, limit),
+        lambda: use_case.get_lists_summary(after_id, limit),
+        TaskListSummaryPage,
+    )
 
 
 @router.put("/{list_id}", response_model=TaskListOut)
+@traced()
 def update_task_list(
     list_id: int,
     data: TaskListUpdate,
@@ -89,10 +190,13 @@ def update_task_list(
         HTTPException (500): If there is an internal server error
     """
     use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
-    return use_case.update_list(list_id, data)
+    task_list = use_case.update_list(list_id, data)
+    read_single_flight.invalidate()
+    return task_list
 
 
 @router.delete("/{list_id}")
+@traced()
 def delete_task_list(
     list_id: int,
     db: Session = Depends(get_db),
@@ -116,14 +220,30 @@ def delete_task_list(
     """
     use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
     use_case.delete_list(list_id)
+    read_single_flight.invalidate()
     return {"message": "List deleted"}
 
 
 @router.get("/{list_id}/tasks", response_model=TaskListFilteredResponse)
+@traced()
 def list_tasks_with_filters(
     list_id: int,
     status: TaskStatus = None,
     priority: str = None,
+    fields: Optional[str] = Query(
+        None, description="Comma separated task fields to return, e.g. id,status."
+    ),
+    include_archived: bool = Query(
+        False, description="Also return the archived (old done) tasks."
+    ),
+    sort: Optional[str] = Query(
+        None,
+        description="Comma separated sort fields, - for descending, e.g. -priority.",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page."
+    ),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -135,20 +255,164 @@ def list_tasks_with_filters(
         list_id (int): The ID of the task list to query.
         status (TaskStatus, optional): Filter by task status. Defaults to None.
         priority (str, optional): Filter by task priority. Defaults to None.
+        fields (str, optional): Sparse fieldset. Only these columns are
+        selected and returned; ``id`` is always included. Defaults to None.
+        include_archived (bool, optional): Also read the archive table.
+        Archived tasks count towards the completion either way. Defaults
+        to False.
+        sort (str, optional): Order of the tasks, e.g. ``-priority`` or
+        ``status,title``. Only the orders served by an index are accepted
+        and all fields share one direction. Defaults to the rank order.
+        cursor (str, optional): Return the page after the one that gave
+        this ``next_cursor``. Requires the same filters and sort.
+        limit (int, optional): Page size. Defaults to None (every task).
 
     Returns:
-        TaskListFilteredResponse: A response containing the list of tasks
-        and the completion percentage.
+        TaskListFilteredResponse: A response containing the list of tasks,
+        the completion percentage and the cursor of the next page, if any.
         HTTP status code 200
+
+    Raises:
+        HTTPException (400): If ``fields`` names an unknown task field, the
+        sort is not supported or the cursor is invalid.
     """
     use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
-    return use_case.list_tasks_with_completion(list_id, status, priority)
+    try:
+        fieldset = parse_task_fields(fields) if fields is not None else None
+        pinned = tuple(
+            name
+            for name, value in (("status", status), ("priority", priority))
+            if value
+        )
+        columns, descending = (
+            parse_task_sort(sort, pinned) if sort else (("rank", "id"), False)
+        )
+        after = decode_task_cursor(cursor, columns, descending) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # With a fieldset the shape changes, so it bypasses response_model
+    return _coalesced_json(
+        (
+            "list_tasks",
+            list_id,
+            status,
+            priority,
+            fieldset,
+            include_archived,
+            columns,
+            descending,
+            cursor,
+            limit,
+        ),
+        lambda: use_case.list_tasks_with_completion(
+            list_id,
+            status,
+            priority,
+            fieldset,
+            include_archived,
+            sort=columns,
+            descending=descending,
+            after=after,
+            limit=limit,
+        ),
+        (
+            task_list_fieldset_response(fieldset)
+            if fieldset
+            else TaskListFilteredResponse
+        ),
+    )
+
+
+@router.get("/{list_id}/events")
+@traced()
+async def stream_task_events(
+    list_id: int,
+    last_event_id: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream task changes of a list as Server-Sent Events.
+
+    Emits ``task.created``, ``task.updated``, ``task.status_changed``,
+    ``task.moved``, ``task.deleted``, ``tasks.archived``, ``list.rebalanced``
+    (every rank of the list changed) and ``list.deleted`` events. Clients resume after a
+    reconnect by sending the standard ``Last-Event-ID`` header; a ``resync``
+    event means the history is gone and the list must be fetched again.
+
+    Args:
+        list_id (int): The ID of the task list to follow.
+        last_event_id (str, optional): Id of the last event received by the
+        client.
+        current_user (dict): Authenticated user (Dependency injection).
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` with one event per change.
+        status: HTTP status code 200
+    """
+    subscription = task_event_broker.subscribe(list_id, last_event_id)
+
+    async def event_source():
+        try:
+            async for event in task_event_broker.stream(
+                subscription, EVENTS_HEARTBEAT_SECONDS
+            ):
+                yield ": keep-alive\n\n" if event is None else event.to_sse()
+        finally:
+            task_event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{list_id}/events/ws")
+async def task_events_websocket(
+    websocket: WebSocket,
+    list_id: int,
+    token: str,
+    last_event_id: Optional[str] = None,
+):
+    """
+    WebSocket variant of the task event stream.
+
+    Browsers cannot set headers on a WebSocket handshake, so the JWT is sent
+    as the ``token`` query parameter. Each message is a JSON object with
+    ``id``, ``type`` and ``data``; ``{"type": "ping"}`` is a keep-alive.
+    """
+    try:
+        get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = task_event_broker.subscribe(list_id, last_event_id)
+    try:
+        async for event in task_event_broker.stream(
+            subscription, EVENTS_HEARTBEAT_SECONDS
+        ):
+            if event is None:
+                await websocket.send_json({"type": "ping"})
+            else:
+                await websocket.send_json(
+                    {"id": event.id, "type": event.type, "data": event.data}
+                )
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task_event_broker.unsubscribe(subscription)
 
 
 @router.post("/{list_id}/tasks", response_model=TaskOut)
+@traced()
 def create_task(
     list_id: int,
     data: TaskCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -171,10 +435,93 @@ def create_task(
         HTTPException (500): If there is an internal server error
     """
     use_case = TaskUseCase(TaskRepository(db))
-    return use_case.create_task(list_id, data)
+    task = use_case.create_task(list_id, data)
+    read_single_flight.invalidate()
+    if len(task.rank) > TASK_RANK_REBALANCE_LENGTH:
+        background_tasks.add_task(_rebalance_task_list, list_id)
+    return task
+
+
+@router.get("/tasks", response_model=TaskBatchResponse)
+@traced()
+def get_tasks_by_ids(
+    ids: str = Query(..., description="Comma separated task IDs, e.g. 1,2,3."),
+    include_archived: bool = Query(
+        False, description="Also return the archived (old done) tasks."
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieve many tasks by ID in a single request.
+
+    Args:
+        ids (str): Comma separated task IDs.
+        include_archived (bool, optional): Also return archived tasks, so
+        that ``missing`` only holds deleted ones.
+        db (Session): Database session (Dependency injection).
+        current_user (dict): Authenticated user (Dependency injection).
+
+    Returns:
+        TaskBatchResponse: Found tasks in request order and the missing IDs.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (400): If an ID is not an integer or too many IDs are sent.
+        HTTPException (500): If there is an internal server error
+    """
+    try:
+        task_ids = [int(task_id) for task_id in ids.split(",") if task_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="ids must be a comma separated list of integers."
+        )
+    use_case = TaskUseCase(TaskRepository(db))
+    return _coalesced_json(
+        ("get_tasks", tuple(task_ids), include_archived),
+        lambda: use_case.get_tasks(task_ids, include_archived),
+        TaskBatchResponse,
+    )
+
+
+@router.post("/tasks/batch", response_model=TaskBatchResponse)
+@traced()
+def get_tasks_batch(
+    data: TaskBatchRequest,
+    include_archived: bool = Query(
+        False, description="Also return the archived (old done) tasks."
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieve many tasks by ID, for ID lists too long for a query string.
+
+    Args:
+        data (TaskBatchRequest): The task IDs to resolve.
+        include_archived (bool, optional): Also return archived tasks, so
+        that ``missing`` only holds deleted ones.
+        db (Session): Database session (Dependency injection).
+        current_user (dict): Authenticated user (Dependency injection).
+
+    Returns:
+        TaskBatchResponse: Found tasks in request order and the missing IDs.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (400): If too many IDs are sent.
+        HTTPException (500): If there is an internal server error
+    """
+    use_case = TaskUseCase(TaskRepository(db))
+    return _coalesced_json(
+        ("get_tasks", tuple(data.ids), include_archived),
+        lambda: use_case.get_tasks(data.ids, include_archived),
+        TaskBatchResponse,
+    )
 
 
 @router.put("/tasks/{task_id}", response_model=TaskOut)
+@traced()
 def update_task(
     task_id: int,
     data: TaskUpdate,
@@ -199,10 +546,13 @@ def update_task(
         HTTPException (500): If there is an internal server error
     """
     use_case = TaskUseCase(TaskRepository(db))
-    return use_case.update_task(task_id, data)
+    task = use_case.update_task(task_id, data)
+    read_single_flight.invalidate()
+    return task
 
 
 @router.patch("/tasks/{task_id}/status", response_model=TaskOut)
+@traced()
 def change_task_status(
     task_id: int,
     new_status: TaskStatus,
@@ -227,10 +577,55 @@ def change_task_status(
         HTTPException (500): If there is an internal server error
     """
     use_case = TaskUseCase(TaskRepository(db))
-    return use_case.change_status(task_id, new_status)
+    task = use_case.change_status(task_id, new_status)
+    read_single_flight.invalidate()
+    return task
+
+
+@router.patch("/tasks/{task_id}/move", response_model=TaskOut)
+@traced()
+def move_task(
+    task_id: int,
+    data: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Move a task to a new position in its list.
+
+    Only the moved task is written. When ranks grow longer than
+    ``TASK_RANK_REBALANCE_LENGTH`` characters, the list is rebalanced in the
+    background after the response.
+
+    Args:
+        task_id (int): ID of the task to move.
+        data (TaskMove): Task to place it after and/or before. At least one
+        is required; the other defaults to the current neighbour.
+        db (Session): Database session (Dependency injection).
+        current_user (dict): Authenticated user (Dependency injection).
+
+    Returns:
+        TaskOut: The moved task with its new ``rank``.
+        status: HTTP status code 200
+
+    Raises:
+        HTTPException (400): If no neighbour is given, a neighbour belongs to
+        another list or ``after_id`` comes after ``before_id``.
+        HTTPException (404): If one of the tasks does not exist.
+        HTTPException (409): If both neighbours are given but are no longer
+        next to each other.
+        HTTPException (500): If there is an internal server error
+    """
+    use_case = TaskUseCase(TaskRepository(db))
+    task = use_case.move_task(task_id, data)
+    read_single_flight.invalidate()
+    if len(task.rank) > TASK_RANK_REBALANCE_LENGTH:
+        background_tasks.add_task(_rebalance_task_list, task.list_id)
+    return task
 
 
 @router.delete("/tasks/{task_id}")
+@traced()
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
@@ -252,4 +647,5 @@ def delete_task(
     """
     use_case = TaskUseCase(TaskRepository(db))
     use_case.delete_task(task_id)
+    read_single_flight.invalidate()
     return {"message": "Task deleted"}
@@ -2,13 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from application.schemas import UserCreate, UserLogin, Token, CreatedUser
 from infrastructure.db.database import get_db
-from infrastructure.db import user_repository
-from utils.jwt_handler import create_access_token
+from infrastructure.db import token_repository, user_repository
+from utils.jwt_handler import (
+    create_access_token,
+    get_current_user,
+    get_revocable_claims,
+    oauth2_scheme,
+)
+from utils.tracing import traced
+from utils.profiler import ProfiledRoute
 
-router_users = APIRouter(prefix="/users", tags=["Usuarios"])
+router_users = APIRouter(prefix="/users", tags=["Usuarios"], route_class=ProfiledRoute)
 
 
 @router_users.post("/register", response_model=CreatedUser)
+@traced()
 def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user in the system.
@@ -32,6 +40,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router_users.post("/login", response_model=Token)
+@traced()
 def login(user: UserLogin, db: Session = Depends(get_db)):
     """Authenticate a user and return an access token.
 
@@ -52,3 +61,30 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Invalid Credentials")
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router_users.post("/logout")
+@traced()
+def logout(
+    token: str = Depends(oauth2_scheme),
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Revoke the access token used for this request.
+
+    Args:
+        token (str): The bearer token (Dependency injection).
+        user (dict): Authenticated user (Dependency injection).
+        db (Session): Database session (Dependency injection).
+
+    Returns:
+        dict: Confirmation message.
+
+    Raises:
+        HTTPException (400): If the token was issued without an ID.
+        HTTPException (401): If the user is not authenticated.
+    """
+    jti, expires_at = get_revocable_claims(token)
+    token_repository.revoke_token(db, jti, expires_at)
+    return {"message": "Logged out"}
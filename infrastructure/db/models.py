@@ -1,9 +1,14 @@
+from datetime import datetime, timezone
 from application.schemas import TaskStatus, TaskPriority
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from infrastructure.db.database import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class TaskListModel(Base):
     __tablename__ = "task_lists"
 
@@ -17,6 +22,22 @@ class TaskListModel(Base):
 
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Covers the per-list status/priority filters and the summary counts
+        Index("ix_tasks_list_status_priority", "list_id", "status", "priority"),
+        # Serves the ordered task list and neighbour lookups of moves
+        Index("ix_tasks_list_rank", "list_id", "rank"),
+        # Serve the other sorts of a task list (application.schemas.TASK_SORT_KEYS).
+        # InnoDB and SQLite end every index entry with the primary key, so
+        # each of these also orders ties by id
+        Index("ix_tasks_list_id", "list_id"),
+        Index("ix_tasks_list_priority", "list_id", "priority"),
+        Index("ix_tasks_list_status_title", "list_id", "status", "title"),
+        # Finds the done tasks old enough to be archived
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+        # Archived tasks keep their ID, so SQLite must never reuse one
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(50), nullable=False)
@@ -24,6 +45,10 @@ class TaskModel(Base):
 
     status = Column(Enum(TaskStatus), default=TaskStatus.pending)
     priority = Column(Enum(TaskPriority), default=TaskPriority.medium)
+    # Fractional index key (utils.fractional_index), NULL for tasks created
+    # before ordering existed; those sort first, by ID
+    rank = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, nullable=False)
 
     list_id = Column(Integer, ForeignKey("task_lists.id"))
 
@@ -31,9 +56,63 @@ class TaskModel(Base):
     task_list = relationship("TaskListModel", back_populates="tasks")
 
 
+class ArchivedTaskModel(Base):
+    """Cold tier: done tasks moved out of ``tasks`` by the task archiver."""
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_list_status_priority", "list_id", "status", "priority"),
+        Index("ix_tasks_archive_list_rank", "list_id", "rank"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(50), nullable=False)
+    description = Column(String(100), nullable=True)
+
+    status = Column(Enum(TaskStatus), nullable=False)
+    priority = Column(Enum(TaskPriority), nullable=False)
+    rank = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, nullable=False)
+
+    list_id = Column(Integer, ForeignKey("task_lists.id"), nullable=False)
+    archived_at = Column(DateTime, default=utcnow, nullable=False)
+
+
+# Columns copied as is between the hot table and the archive
+ARCHIVED_COLUMNS = [column.name for column in TaskModel.__table__.columns]
+
+
+class TaskListStatsModel(Base):
+    """
+    Task counts of a list per status and priority, archived tasks included.
+
+    Kept up to date in the transaction of every task write (see
+    ``infrastructure.db.task_list_stats``), so completion reads never count
+    tasks. Every list has one row per combination, zeros included.
+    """
+
+    __tablename__ = "task_list_stats"
+
+    list_id = Column(Integer, ForeignKey("task_lists.id"), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
 class UserModel(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(20), unique=True, index=True, nullable=False)
     password_hash = Column(String(500), nullable=False)
+
+
+class RevokedTokenModel(Base):
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(32), unique=True, nullable=False)
+    # Rows are useless once the token has expired; the index serves both
+    # the cache reload and the cleanup
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=utcnow, nullable=False)
@@ -1,31 +1,156 @@
-from sqlalchemy.orm import Session
+import os
+from collections import Counter
+from dotenv import load_dotenv
+from sqlalchemy import and_, false, func, or_, select, true, union_all, update
+from sqlalchemy.orm import Session, aliased, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
-from infrastructure.db.models import TaskModel, TaskListModel
+from infrastructure.db.models import (
+    ARCHIVED_COLUMNS,
+    ArchivedTaskModel,
+    TaskListModel,
+    TaskListStatsModel,
+    TaskModel,
+)
+from infrastructure.db import task_list_stats
+from infrastructure.db.status_write_behind import status_write_behind
+from infrastructure.events.task_event_broker import task_event_broker
+from utils.fractional_index import evenly_spaced_keys, key_between
+from utils.tracing import traced
 from application.schemas import (
+    TaskOut,
     TaskListOut,
     TaskStatus,
     TaskPriority,
-    TaskCreate,
     TaskListUpdate,
+    TaskUpdate,
 )
 
+load_dotenv()
+
+TASK_BATCH_MAX_SIZE = int(os.getenv("TASK_BATCH_MAX_SIZE", "500"))
+TASK_BATCH_CHUNK_SIZE = int(os.getenv("TASK_BATCH_CHUNK_SIZE", "200"))
+TASK_RANK_REBALANCE_LENGTH = int(os.getenv("TASK_RANK_REBALANCE_LENGTH", "16"))
+TASK_RANK_MAX_LENGTH = TaskModel.rank.type.length
+
+
+def _task_payload(task: TaskModel) -> dict:
+    return TaskOut.model_validate(task).model_dump(mode="json")
+
+
+def _apply_pending_status(tasks: list[TaskModel]) -> list[TaskModel]:
+    """Overlay status changes still waiting in the write-behind queue."""
+    if status_write_behind is None or not status_write_behind.has_pending():
+        return tasks
+    pending = status_write_behind.snapshot()
+    for task in tasks:
+        if task.id in pending:
+            set_committed_value(task, "status", pending[task.id])
+    return tasks
+
+
+def _pending_deltas(db: Session, list_ids) -> Counter:
+    """Counter changes of the status changes still queued for these lists."""
+    if status_write_behind is None or not status_write_behind.has_pending():
+        return Counter()
+    pending = status_write_behind.snapshot(list_ids)
+    return task_list_stats.status_deltas(db, pending) if pending else Counter()
+
+
+def _task_filters(model, list_id: int, status_task=None, priority=None) -> list:
+    """Filters of a task list read, for either tier."""
+    filters = [model.list_id == list_id]
+    if status_task:
+        filters.append(model.status == status_task)
+    if priority:
+        filters.append(model.priority == priority)
+    return filters
+
+
+def _enum_order(enum_class, dialect) -> list:
+    """Order in which the database sorts the values of an Enum column."""
+    if dialect.supports_native_enum:
+        # MySQL ENUM (and PostgreSQL enum types) sort by declaration order
+        return list(enum_class)
+    return sorted(enum_class, key=lambda member: member.name)
+
+
+def _keyset_after(entity, columns, values, descending, dialect):
+    """
+    Condition matching the rows that come after ``values`` in the order of
+    ``columns``.
+
+    Enum columns are compared by membership: MySQL sorts an ENUM by
+    declaration order but compares it to a string as a string. NULLs (tasks
+    without a rank) sort first, as in MySQL and SQLite.
+    """
+
+    def equal(name, value):
+        column = getattr(entity, name)
+        if value is None:
+            return column.is_(None)
+        enum_class = getattr(column.type, "enum_class", None)
+        return column == (enum_class(value) if enum_class else value)
+
+    def beyond(name, value, inclusive=False):
+        column = getattr(entity, name)
+        enum_class = getattr(column.type, "enum_class", None)
+        if enum_class is not None:
+            order = _enum_order(enum_class, dialect)
+            position = order.index(enum_class(value))
+            if descending:
+                later = order[: position + 1 if inclusive else position]
+            else:
+                later = order[position if inclusive else position + 1 :]
+            return column.in_(later) if later else false()
+        if value is None:
+            if descending:
+                return column.is_(None) if inclusive else false()
+            return true() if inclusive else column.is_not(None)
+        if descending:
+            bound = column <= value if inclusive else column < value
+            if TaskModel.__table__.c[name].nullable:
+                return or_(bound, column.is_(None))
+            return bound
+        return column >= value if inclusive else column > value
+
+    # The bound on the first column alone lets the index seek straight to the
+    # page instead of reading every row before it
+    return and_(
+        beyond(columns[0], values[0], inclusive=True),
+        or_(
+            *(
+                and_(
+                    *(equal(columns[j], values[j]) for j in range(i)),
+                    beyond(columns[i], values[i]),
+                )
+                for i in range(len(columns))
+            )
+        ),
+    )
+
 
 # TaskList repository
 class TaskListRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @traced()
     def create_list(self, name: str) -> TaskListModel:
         task_list = TaskListModel(name=name)
         self.db.add(task_list)
+        self.db.flush()
+        task_list_stats.seed_stats(self.db, task_list.id)
         self.db.commit()
         self.db.refresh(task_list)
         return task_list
 
+    @traced()
     def get_list(self, list_id: int) -> TaskListModel:
         return self.db.query(TaskListModel).filter_by(id=list_id).first()
 
+    @traced()
     def update_name_list(self, list_id: int, data: TaskListUpdate) -> TaskListModel:
         task_list = self.get_list(list_id)
         if task_list:
@@ -34,15 +159,94 @@ class TaskListRepository:
             self.db.refresh(task_list)
         return task_list
 
+    @traced()
     def get_all_lists(self) -> list[TaskListOut]:
         db_lists = self.db.query(TaskListModel).all()
         return [TaskListOut.model_validate(db_list) for db_list in db_lists]
 
+    @traced()
+    def get_lists_summary(self, after_id: int, limit: int) -> list[tuple]:
+        """
+        Read the task counters of a page of lists by status and priority.
+
+        Lists are paginated by id (keyset) before joining, so the cost only
+        depends on the page size, never on the number of tasks.
+
+        Args:
+            after_id (int): Only lists with a greater id are returned.
+            limit (int): Maximum number of lists in the page.
+
+        Returns:
+            list[tuple]: ``(list_id, name, status, priority, count)`` rows
+            ordered by list id, archived tasks and queued status changes
+            included. Lists without tasks yield a single row with ``None``
+            status and priority and a count of 0.
+        """
+        try:
+            page = (
+                self.db.query(TaskListModel.id, TaskListModel.name)
+                .filter(TaskListModel.id > after_id)
+                .order_by(TaskListModel.id)
+                .limit(limit)
+                .subquery()
+            )
+            query = (
+                self.db.query(
+                    page.c.id,
+                    page.c.name,
+                    TaskListStatsModel.status,
+                    TaskListStatsModel.priority,
+                    TaskListStatsModel.count,
+                )
+                .select_from(page)
+                .outerjoin(TaskListStatsModel, TaskListStatsModel.list_id == page.c.id)
+                .order_by(page.c.id)
+            )
+            names: dict[int, str] = {}
+            counts: Counter = Counter()
+            for list_id, name, task_status, priority, count in query.all():
+                if task_status is not None:
+                    counts[(list_id, task_status, priority)] += count
+                elif list_id not in names:
+                    # Lists created before the counters existed: count their
+                    # tasks, without writing on a read
+                    for key, count in task_list_stats.count_from_tasks(
+                        self.db, list_id
+                    ).items():
+                        counts[(list_id, *key)] += count
+                names[list_id] = name
+            # Status changes still queued are added, not flushed, so a read
+            # never waits for a write
+            counts.update(_pending_deltas(self.db, set(names)))
+
+            rows = []
+            for list_id, name in names.items():
+                list_rows = [
+                    (list_id, name, task_status, priority, count)
+                    for (row_list_id, task_status, priority), count in counts.items()
+                    if row_list_id == list_id
+                ]
+                rows.extend(list_rows or [(list_id, name, None, None, 0)])
+            return rows
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}",
+            )
+
+    @traced()
     def delete_list(self, list_id: int):
         task_list = self.get_list(list_id)
         if task_list:
+            for model in (ArchivedTaskModel, TaskListStatsModel):
+                self.db.query(model).filter(model.list_id == list_id).delete(
+                    synchronize_session=False
+                )
             self.db.delete(task_list)
             self.db.commit()
+            task_event_broker.publish(list_id, "list.deleted", {"id": list_id})
+            task_event_broker.forget(list_id)
 
 
 # Task repository
@@ -50,6 +254,7 @@ class TaskRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @traced()
     def create_task(
         self,
         list_id: int,
@@ -58,18 +263,34 @@ class TaskRepository:
         status: TaskStatus,
         priority: TaskPriority,
     ) -> TaskModel:
+        # Two concurrent creates would otherwise read the same last rank and
+        # store equal ranks
+        self._lock_list(list_id)
+        rank = key_between(self._last_rank(list_id), None)
+        # The background rebalance fell behind: rebalance now rather than
+        # overflow the column
+        rebalanced = len(rank) > TASK_RANK_MAX_LENGTH
+        if rebalanced:
+            self.rebalance_list(list_id, commit=False)
+            rank = key_between(self._last_rank(list_id), None)
         task = TaskModel(
             list_id=list_id,
             title=title,
             description=description,
             status=status,
             priority=priority,
+            rank=rank,
         )
         self.db.add(task)
+        task_list_stats.apply_deltas(self.db, Counter({(list_id, status, priority): 1}))
         self.db.commit()
         self.db.refresh(task)
+        task_event_broker.publish(list_id, "task.created", _task_payload(task))
+        if rebalanced:
+            task_event_broker.publish(list_id, "list.rebalanced", {"id": list_id})
         return task
 
+    @traced()
     def get_task(self, task_id: int) -> TaskModel:
         try:
             task = self.db.query(TaskModel).filter_by(id=task_id).first()
@@ -80,6 +301,7 @@ class TaskRepository:
                     detail=f"Task with ID {task_id} not found",
                 )
 
+            _apply_pending_status([task])
             return task
 
         except SQLAlchemyError as e:
@@ -89,37 +311,325 @@ class TaskRepository:
                 detail=f"Database error: {str(e)}",
             )
 
+    @traced()
+    def get_tasks_by_ids(
+        self, task_ids: list[int], include_archived: bool = False
+    ) -> list[TaskModel]:
+        """
+        Load many tasks by ID with ``WHERE id IN (...)`` queries of at most
+        ``TASK_BATCH_CHUNK_SIZE`` IDs each.
+
+        Args:
+            task_ids (list[int]): IDs to load, without duplicates.
+            include_archived (bool, optional): Also look the IDs not found in
+            ``tasks`` up in the archive.
+
+        Returns:
+            list[TaskModel]: The tasks found, in no particular order. Archived
+            ones are ``ArchivedTaskModel`` rows.
+
+        Raises:
+            HTTPException (400): If more than ``TASK_BATCH_MAX_SIZE`` IDs
+            are requested.
+        """
+        if len(task_ids) > TASK_BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {TASK_BATCH_MAX_SIZE} task IDs can be requested.",
+            )
+        try:
+            tasks = self._load_by_ids(TaskModel, task_ids)
+            if include_archived:
+                found = {task.id for task in tasks}
+                tasks.extend(
+                    self._load_by_ids(
+                        ArchivedTaskModel,
+                        [task_id for task_id in task_ids if task_id not in found],
+                    )
+                )
+            return _apply_pending_status(tasks)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}",
+            )
+
+    def _load_by_ids(self, model, task_ids: list[int]) -> list:
+        rows = []
+        for start in range(0, len(task_ids), TASK_BATCH_CHUNK_SIZE):
+            chunk = task_ids[start : start + TASK_BATCH_CHUNK_SIZE]
+            rows.extend(self.db.query(model).filter(model.id.in_(chunk)).all())
+        return rows
+
+    @traced()
     def update_task_status(self, task_id: int, new_status: TaskStatus) -> TaskModel:
         task = self.get_task(task_id)
-        if task:
+        if task and status_write_behind is not None:
+            status_write_behind.enqueue(task_id, new_status, task.list_id)
+            set_committed_value(task, "status", new_status)
+            task_event_broker.publish(
+                task.list_id, "task.status_changed", _task_payload(task)
+            )
+        elif task:
+            list_id, stored_status, priority = self._lock_stored_state(task_id)
             task.status = new_status
+            task_list_stats.apply_deltas(
+                self.db,
+                Counter(
+                    {
+                        (list_id, stored_status, priority): -1,
+                        (list_id, new_status, priority): 1,
+                    }
+                ),
+            )
             self.db.commit()
             self.db.refresh(task)
+            task_event_broker.publish(
+                task.list_id, "task.status_changed", _task_payload(task)
+            )
         return task
 
-    def update_task(self, task_id: int, new_data: TaskCreate) -> TaskModel:
+    @traced()
+    def update_task(self, task_id: int, new_data: TaskUpdate) -> TaskModel:
         task = self.get_task(task_id)
         if task:
+            if status_write_behind is not None:
+                status_write_behind.discard(task_id)
+            # Status and priority are optional: omitted ones keep their value,
+            # a pending write-behind status included
+            new_status = new_data.status or task.status
+            new_priority = new_data.priority or task.priority
+            list_id, stored_status, stored_priority = self._lock_stored_state(task_id)
+            # Drop the overlaid pending status so the new one is always written
+            set_committed_value(task, "status", stored_status)
             task.title = new_data.title
             task.description = new_data.description
-            task.status = new_data.status
-            task.priority = new_data.priority
+            task.status = new_status
+            task.priority = new_priority
+            deltas = Counter({(list_id, stored_status, stored_priority): -1})
+            deltas[(list_id, new_status, new_priority)] += 1
+            task_list_stats.apply_deltas(self.db, deltas)
             self.db.commit()
             self.db.refresh(task)
+            task_event_broker.publish(task.list_id, "task.updated", _task_payload(task))
         return task
 
+    @traced()
     def delete_task(self, task_id: int):
         task = self.get_task(task_id)
         if task:
+            if status_write_behind is not None:
+                status_write_behind.discard(task_id)
+            list_id, stored_status, priority = self._lock_stored_state(task_id)
             self.db.delete(task)
+            task_list_stats.apply_deltas(
+                self.db, Counter({(list_id, stored_status, priority): -1})
+            )
+            self.db.commit()
+            task_event_broker.publish(list_id, "task.deleted", {"id": task_id})
+
+    @traced()
+    def move_task(
+        self, task_id: int, after_id: int | None, before_id: int | None
+    ) -> TaskModel:
+        """
+        Move a task right after ``after_id`` and/or right before ``before_id``
+        by giving it a rank between theirs. Only the moved task is written,
+        unless a neighbour has no rank yet or two neighbours share one: then
+        the list is rebalanced first.
+
+        Args:
+            task_id (int): ID of the task to move.
+            after_id (int | None): Task to place it after.
+            before_id (int | None): Task to place it before.
+
+        Returns:
+            TaskModel: The moved task with its new rank.
+
+        Raises:
+            HTTPException (400): If no neighbour is given, a neighbour is the
+            task itself or belongs to another list, or ``after_id`` comes
+            after ``before_id``.
+            HTTPException (404): If one of the tasks does not exist.
+            HTTPException (409): If ``after_id`` and ``before_id`` are not
+            next to each other.
+        """
+        if after_id is None and before_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_id or before_id is required.",
+            )
+        if task_id in (after_id, before_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A task cannot be moved next to itself.",
+            )
+        task = self.get_task(task_id)
+        # Serializes moves and rebalances of a list so none works on
+        # ranks another one is changing
+        self._lock_list(task.list_id)
+        after = self._neighbour(after_id, task.list_id)
+        before = self._neighbour(before_id, task.list_id)
+
+        unranked = any(n is not None and n.rank is None for n in (after, before))
+        tied = bool(after and before and after.rank == before.rank)
+        rebalanced = unranked or tied
+        if rebalanced:
+            self.rebalance_list(task.list_id, commit=False)
+        if after and before and after.rank > before.rank:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Task {after_id} comes after task {before_id}.",
+            )
+
+        rank = key_between(*self._move_bounds(task, after, before))
+        if len(rank) > TASK_RANK_MAX_LENGTH:
+            self.rebalance_list(task.list_id, commit=False)
+            rebalanced = True
+            rank = key_between(*self._move_bounds(task, after, before))
+
+        task.rank = rank
+        self.db.commit()
+        self.db.refresh(task)
+        _apply_pending_status([task])
+        task_event_broker.publish(task.list_id, "task.moved", _task_payload(task))
+        if rebalanced:
+            task_event_broker.publish(
+                task.list_id, "list.rebalanced", {"id": task.list_id}
+            )
+        return task
+
+    @traced()
+    def rebalance_list(self, list_id: int, commit: bool = True) -> int:
+        """
+        Give the tasks of a list short, evenly spaced ranks in their current
+        order. Tasks without a rank keep their place at the top, by ID.
+
+        Args:
+            list_id (int): ID of the list to rebalance.
+            commit (bool): Commit and notify subscribers. Defaults to True.
+
+        Returns:
+            int: The number of tasks ranked.
+        """
+        if commit:
+            self._lock_list(list_id)
+        task_ids = [
+            task_id
+            for (task_id,) in self.db.query(TaskModel.id)
+            .filter(TaskModel.list_id == list_id)
+            .order_by(TaskModel.rank, TaskModel.id)
+        ]
+        if task_ids:
+            self.db.execute(
+                update(TaskModel),
+                [
+                    {"id": task_id, "rank": rank}
+                    for task_id, rank in zip(
+                        task_ids, evenly_spaced_keys(len(task_ids))
+                    )
+                ],
+            )
+            # The bulk update bypasses the identity map
+            self.db.expire_all()
+        if commit:
             self.db.commit()
+            task_event_broker.publish(list_id, "list.rebalanced", {"id": list_id})
+        return len(task_ids)
+
+    def _move_bounds(
+        self, task: TaskModel, after: TaskModel | None, before: TaskModel | None
+    ) -> tuple[str | None, str | None]:
+        """
+        Ranks to move ``task`` between, looking up the missing neighbour.
+
+        Raises:
+            HTTPException (409): If both neighbours are given but other
+            tasks sit between them (the client's view of the list is stale).
+        """
+        others = self.db.query(TaskModel).filter(
+            TaskModel.list_id == task.list_id, TaskModel.id != task.id
+        )
+        if after is None:
+            lower = (
+                others.filter(TaskModel.rank < before.rank)
+                .with_entities(func.max(TaskModel.rank))
+                .scalar()
+            )
+            return lower, before.rank
+
+        upper = (
+            others.filter(TaskModel.rank > after.rank)
+            .with_entities(func.min(TaskModel.rank))
+            .scalar()
+        )
+        if before is not None and upper != before.rank:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Task {before.id} does not directly follow task {after.id}.",
+            )
+        return after.rank, upper
+
+    def _lock_stored_state(self, task_id: int) -> tuple:
+        """
+        Lock a task row and return its stored ``(list_id, status, priority)``,
+        which the stats counters are moved away from.
+        """
+        return (
+            self.db.query(TaskModel.list_id, TaskModel.status, TaskModel.priority)
+            .filter(TaskModel.id == task_id)
+            .with_for_update()
+            .one()
+        )
+
+    def _last_rank(self, list_id: int) -> str | None:
+        return (
+            self.db.query(func.max(TaskModel.rank))
+            .filter(TaskModel.list_id == list_id)
+            .scalar()
+        )
+
+    def _lock_list(self, list_id: int):
+        self.db.query(TaskListModel.id).filter(
+            TaskListModel.id == list_id
+        ).with_for_update().scalar()
+
+    def _neighbour(self, task_id: int | None, list_id: int) -> TaskModel | None:
+        if task_id is None:
+            return None
+        task = self.get_task(task_id)
+        if task.list_id != list_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Task {task_id} belongs to another list.",
+            )
+        return task
 
+    @traced()
     def get_tasks_by_list(
         self,
         list_id: int,
         status_task: TaskStatus = None,
         priority: TaskPriority = None,
+        fields: tuple[str, ...] = None,
+        include_archived: bool = False,
+        sort: tuple[str, ...] = ("rank", "id"),
+        descending: bool = False,
+        after: list = None,
+        limit: int = None,
     ) -> list[TaskModel]:
+        """
+        Read the tasks of a list, optionally one page at a time.
+
+        Args:
+            sort (tuple[str, ...], optional): Sort columns, as returned by
+            ``parse_task_sort``. Defaults to the rank order.
+            descending (bool, optional): Reverse the order.
+            after (list, optional): Sort values of the last task of the
+            previous page (keyset pagination).
+            limit (int, optional): Maximum number of tasks to return.
+        """
         try:
             if list_id <= 0:
                 raise HTTPException(
@@ -127,20 +637,73 @@ class TaskRepository:
                     detail="The ID should be a positive integer.",
                 )
 
-            query = self.db.query(TaskModel).filter(TaskModel.list_id == list_id)
-            if not query:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"List with ID {list_id} not found",
+            if (
+                (status_task or "status" in sort)
+                and status_write_behind is not None
+                and status_write_behind.snapshot({list_id})
+            ):
+                # The stored status decides the rows and their order: write
+                # the changes of this list only, not the whole queue
+                status_write_behind.flush(list_id)
+            if include_archived:
+                # Filters go into each branch so both tiers use their indexes
+                tiers = union_all(
+                    *(
+                        select(
+                            *(model.__table__.c[name] for name in ARCHIVED_COLUMNS)
+                        ).where(*_task_filters(model, list_id, status_task, priority))
+                        for model in (TaskModel, ArchivedTaskModel)
+                    )
+                ).subquery("task_tiers")
+                entity = aliased(TaskModel, tiers, adapt_on_names=True)
+                query = self.db.query(entity)
+            else:
+                entity = TaskModel
+                query = self.db.query(TaskModel).filter(
+                    *_task_filters(TaskModel, list_id, status_task, priority)
+                )
+            if fields:
+                # status is always needed to compute the completion percentage,
+                # the sort columns to build the next cursor
+                columns = set(fields) | {"status"} | set(sort)
+                query = query.options(
+                    load_only(*(getattr(entity, name) for name in columns))
+                )
+            if after is not None:
+                query = query.filter(
+                    _keyset_after(
+                        entity, sort, after, descending, self.db.get_bind().dialect
+                    )
                 )
-            if status_task:
-                query = query.filter(TaskModel.status == status_task)
-            if priority:
-                query = query.filter(TaskModel.priority == priority)
-            return query.all()
+            order = [getattr(entity, name) for name in sort]
+            query = query.order_by(
+                *(column.desc() for column in order) if descending else order
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return _apply_pending_status(query.all())
         except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error al consultar tareas: {str(e)}",
             )
+
+    @traced()
+    def count_tasks(
+        self,
+        list_id: int,
+        status_task: TaskStatus = None,
+        priority: TaskPriority = None,
+    ) -> tuple[int, int]:
+        """
+        Count the tasks of a list matching the filters, archived ones
+        included, and the done ones, from the task_list_stats counters.
+        """
+        return task_list_stats.count_tasks(
+            self.db,
+            list_id,
+            status_task,
+            priority,
+            pending=_pending_deltas(self.db, {list_id}),
+        )
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+from dotenv import load_dotenv
+from sqlalchemy import delete, insert, select, update
+from application.schemas import TaskStatus
+from infrastructure.db.database import SessionLocal
+from infrastructure.db.models import ARCHIVED_COLUMNS, ArchivedTaskModel, TaskModel
+from infrastructure.db.task_list_stats import apply_deltas, status_deltas
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+STATUS_WRITE_BEHIND_ENABLED = os.getenv(
+    "STATUS_WRITE_BEHIND_ENABLED", "false"
+).lower() in ("1", "true", "yes")
+STATUS_WRITE_BEHIND_WINDOW_MS = int(os.getenv("STATUS_WRITE_BEHIND_WINDOW_MS", "200"))
+
+
+class StatusWriteBehindQueue:
+    """
+    Coalesces task status changes in memory and flushes them in batches.
+
+    Only the latest status of each task is kept, so a task flipped many
+    times inside one window costs a single row update. A background thread
+    flushes every window; ``stop`` performs a final flush so acknowledged
+    changes are written before the process exits.
+    """
+
+    def __init__(self, session_factory, window_ms: int = STATUS_WRITE_BEHIND_WINDOW_MS):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        # task_id -> (list_id, new status)
+        self._pending: dict[int, tuple[int, TaskStatus]] = {}
+        # Batch being written: still served by snapshot() until it commits
+        self._in_flight: dict[int, tuple[int, TaskStatus]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    def enqueue(self, task_id: int, new_status: TaskStatus, list_id: int):
+        with self._lock:
+            self._pending[task_id] = (list_id, new_status)
+
+    def discard(self, task_id: int):
+        """
+        Forget a pending change superseded by a synchronous write.
+
+        Waits for an in-progress flush so it cannot land after the caller's
+        own commit.
+        """
+        with self._flush_lock, self._lock:
+            self._pending.pop(task_id, None)
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending or self._in_flight)
+
+    def snapshot(self, list_ids=None) -> dict[int, TaskStatus]:
+        """
+        Pending status per task ID.
+
+        Args:
+            list_ids (optional): Only return tasks of these lists.
+        """
+        with self._lock:
+            changes = {**self._in_flight, **self._pending}
+        return {
+            task_id: new_status
+            for task_id, (list_id, new_status) in changes.items()
+            if list_ids is None or list_id in list_ids
+        }
+
+    def flush(self, list_id: int = None) -> int:
+        """
+        Write pending changes, one UPDATE per target status, and the
+        matching task_list_stats changes in the same transaction.
+
+        A task archived after its change was queued is moved back to
+        ``tasks`` when the change makes it no longer done, so the archive
+        only ever holds done tasks.
+
+        Args:
+            list_id (int, optional): Only write the changes of this list.
+
+        Returns:
+            int: Number of tasks written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if list_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {
+                        task_id: change
+                        for task_id, change in self._pending.items()
+                        if change[0] == list_id
+                    }
+                    for task_id in batch:
+                        del self._pending[task_id]
+                self._in_flight = batch
+            if not batch:
+                return 0
+
+            statuses = {
+                task_id: new_status for task_id, (_, new_status) in batch.items()
+            }
+            by_status: dict[TaskStatus, list[int]] = {}
+            for task_id, new_status in statuses.items():
+                by_status.setdefault(new_status, []).append(task_id)
+
+            db = self.session_factory()
+            try:
+                # Lock the hot rows first, so the archiver skips them
+                hot_ids = set(
+                    db.scalars(
+                        select(TaskModel.id)
+                        .where(TaskModel.id.in_(statuses))
+                        .with_for_update()
+                    )
+                )
+                self._reopen_archived(
+                    db,
+                    [
+                        task_id
+                        for task_id, new_status in statuses.items()
+                        if task_id not in hot_ids and new_status != TaskStatus.done
+                    ],
+                )
+                deltas = status_deltas(db, statuses)
+                for new_status, task_ids in by_status.items():
+                    db.execute(
+                        update(TaskModel)
+                        .where(TaskModel.id.in_(task_ids))
+                        .values(status=new_status)
+                    )
+                apply_deltas(db, deltas)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    for task_id, change in batch.items():
+                        self._pending.setdefault(task_id, change)
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight = {}
+                db.close()
+            return len(batch)
+
+    @staticmethod
+    def _reopen_archived(db, task_ids: list[int]):
+        """Move archived tasks back to ``tasks``. Does not commit."""
+        if not task_ids:
+            return
+        archived_ids = db.scalars(
+            select(ArchivedTaskModel.id)
+            .where(ArchivedTaskModel.id.in_(task_ids))
+            .with_for_update()
+        ).all()
+        if not archived_ids:
+            return
+        cold = ArchivedTaskModel.__table__.c
+        db.execute(
+            insert(TaskModel).from_select(
+                ARCHIVED_COLUMNS,
+                select(*(cold[name] for name in ARCHIVED_COLUMNS)).where(
+                    cold.id.in_(archived_ids)
+                ),
+            )
+        )
+        db.execute(
+            delete(ArchivedTaskModel).where(ArchivedTaskModel.id.in_(archived_ids))
+        )
+
+    def start(self):
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, name="status-write-behind", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.window):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Status write-behind flush failed, will retry")
+
+
+status_write_behind = (
+    StatusWriteBehindQueue(SessionLocal) if STATUS_WRITE_BEHIND_ENABLED else None
+)
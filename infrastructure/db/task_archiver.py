@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+from datetime import timedelta
+from dotenv import load_dotenv
+from sqlalchemy import delete, insert, select
+from application.schemas import TaskStatus
+from infrastructure.db.database import SessionLocal
+from infrastructure.db.models import (
+    ARCHIVED_COLUMNS,
+    ArchivedTaskModel,
+    TaskModel,
+    utcnow,
+)
+from infrastructure.db.status_write_behind import status_write_behind
+from infrastructure.events.task_event_broker import task_event_broker
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TASK_ARCHIVE_ENABLED = os.getenv("TASK_ARCHIVE_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TASK_ARCHIVE_AFTER_DAYS = float(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "30"))
+TASK_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "500"))
+TASK_ARCHIVE_INTERVAL_SECONDS = float(
+    os.getenv("TASK_ARCHIVE_INTERVAL_SECONDS", "3600")
+)
+
+
+class TaskArchiver:
+    """
+    Moves done tasks that have not changed for ``after_days`` from ``tasks``
+    to ``tasks_archive``.
+
+    Each batch copies and deletes at most ``batch_size`` tasks in its own
+    transaction, so locks stay short and the hot table shrinks gradually.
+    ``task_list_stats`` counts archived tasks too, so it is left as is.
+    A background thread runs a full pass every ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        after_days: float = TASK_ARCHIVE_AFTER_DAYS,
+        batch_size: int = TASK_ARCHIVE_BATCH_SIZE,
+        interval: float = TASK_ARCHIVE_INTERVAL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.after = timedelta(days=after_days)
+        self.batch_size = batch_size
+        self.interval = interval
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    def archive_batch(self) -> int:
+        """
+        Archive one batch of old done tasks.
+
+        Returns:
+            int: Number of tasks archived.
+        """
+        # Tasks with a status change still waiting to be written stay hot.
+        # Taken before the SELECT so no change queued before it is missed;
+        # later ones are written to the archive by the flush.
+        pending = status_write_behind.snapshot() if status_write_behind else {}
+        db = self.session_factory()
+        try:
+            query = (
+                select(TaskModel.id, TaskModel.list_id)
+                .where(
+                    TaskModel.status == TaskStatus.done,
+                    TaskModel.updated_at < utcnow() - self.after,
+                )
+                .order_by(TaskModel.updated_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            if pending:
+                # Filtered in SQL so batches stay full
+                query = query.where(TaskModel.id.not_in(list(pending)))
+            rows = db.execute(query).all()
+            if not rows:
+                db.rollback()
+                return 0
+
+            task_ids = [row.id for row in rows]
+            hot = TaskModel.__table__.c
+            db.execute(
+                insert(ArchivedTaskModel).from_select(
+                    ARCHIVED_COLUMNS,
+                    select(*(hot[name] for name in ARCHIVED_COLUMNS)).where(
+                        hot.id.in_(task_ids)
+                    ),
+                )
+            )
+            db.execute(delete(TaskModel).where(TaskModel.id.in_(task_ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        by_list: dict[int, list[int]] = {}
+        for row in rows:
+            by_list.setdefault(row.list_id, []).append(row.id)
+        for list_id, archived_ids in by_list.items():
+            task_event_broker.publish(list_id, "tasks.archived", {"ids": archived_ids})
+        return len(rows)
+
+    def run_once(self) -> int:
+        """
+        Archive batches until no old done task is left.
+
+        Returns:
+            int: Number of tasks archived.
+        """
+        with self._run_lock:
+            total = 0
+            while not self._stop.is_set():
+                archived = self.archive_batch()
+                total += archived
+                if archived < self.batch_size:
+                    break
+            return total
+
+    def start(self):
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, name="task-archiver", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                archived = self.run_once()
+                if archived:
+                    logger.info("Archived %d done tasks", archived)
+            except Exception:
+                logger.exception("Task archiving failed, will retry")
+
+
+task_archiver = TaskArchiver(SessionLocal)
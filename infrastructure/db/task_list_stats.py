@@ -0,0 +1,246 @@
+"""
+Per-list task counters (``task_list_stats``).
+
+Every task write adds its count changes to the counters in its own
+transaction, so reading the completion of a list is a primary key lookup
+whatever its size. Archived tasks stay counted: archiving a task does not
+change the counters.
+
+Lists created before the table existed have no counters: reads count their
+tasks instead, without writing. ``recount_list`` creates missing counters
+and repairs drifted ones. To check every list:
+
+    python -m infrastructure.db.task_list_stats
+"""
+
+import argparse
+from collections import Counter
+from itertools import product
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from application.schemas import TaskPriority, TaskStatus
+from infrastructure.db.database import SessionLocal
+from infrastructure.db.models import (
+    ArchivedTaskModel,
+    TaskListModel,
+    TaskListStatsModel,
+    TaskModel,
+)
+from utils.tracing import traced
+
+COMBINATIONS = list(product(TaskStatus, TaskPriority))
+
+
+def seed_stats(db: Session, list_id: int):
+    """Add the zero counters of a new list. Does not commit."""
+    db.add_all(
+        TaskListStatsModel(
+            list_id=list_id, status=task_status, priority=priority, count=0
+        )
+        for task_status, priority in COMBINATIONS
+    )
+
+
+@traced("task_list_stats.apply_deltas")
+def apply_deltas(db: Session, deltas: Counter):
+    """
+    Add count changes to the counters, in the caller's transaction.
+
+    Args:
+        deltas (Counter): Change of the task count per ``(list_id, status,
+        priority)``. Zero changes are skipped.
+    """
+    # A fixed row order keeps concurrent writers from deadlocking
+    for (list_id, task_status, priority), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        db.execute(
+            update(TaskListStatsModel)
+            .where(
+                TaskListStatsModel.list_id == list_id,
+                TaskListStatsModel.status == task_status,
+                TaskListStatsModel.priority == priority,
+            )
+            .values(count=TaskListStatsModel.count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@traced("task_list_stats.status_deltas")
+def status_deltas(db: Session, statuses: dict[int, TaskStatus]) -> Counter:
+    """
+    Counter changes of moving tasks to new statuses, away from their stored
+    status. Tasks no longer in ``tasks`` are skipped.
+
+    Args:
+        statuses (dict[int, TaskStatus]): New status per task ID.
+    """
+    deltas: Counter = Counter()
+    for task in db.execute(
+        select(
+            TaskModel.id, TaskModel.list_id, TaskModel.status, TaskModel.priority
+        ).where(TaskModel.id.in_(statuses))
+    ):
+        new_status = statuses[task.id]
+        if task.status != new_status:
+            deltas[(task.list_id, task.status, task.priority)] -= 1
+            deltas[(task.list_id, new_status, task.priority)] += 1
+    return deltas
+
+
+@traced("task_list_stats.count_tasks")
+def count_tasks(
+    db: Session,
+    list_id: int,
+    task_status: TaskStatus = None,
+    priority: TaskPriority = None,
+    pending: Counter = None,
+) -> tuple[int, int]:
+    """
+    Count the tasks of a list matching the filters, archived ones included.
+
+    Args:
+        pending (Counter, optional): Changes not written yet, as returned by
+        ``status_deltas``, added on top of the counters.
+
+    Returns:
+        tuple[int, int]: The number of tasks and how many of them are done.
+    """
+    rows = (
+        db.query(
+            TaskListStatsModel.status,
+            TaskListStatsModel.priority,
+            TaskListStatsModel.count,
+        )
+        .filter(TaskListStatsModel.list_id == list_id)
+        .all()
+    )
+    if rows:
+        counts = Counter(
+            {
+                (row_status, row_priority): count
+                for row_status, row_priority, count in rows
+            }
+        )
+    else:
+        # No counters yet (or no such list): count without writing, so the
+        # caller's session and the objects it loaded are left untouched
+        counts = count_from_tasks(db, list_id)
+    for (delta_list_id, row_status, row_priority), delta in (pending or {}).items():
+        if delta_list_id == list_id:
+            counts[(row_status, row_priority)] += delta
+    matching = [
+        (row_status, count)
+        for (row_status, row_priority), count in counts.items()
+        if (not task_status or row_status == task_status)
+        and (not priority or row_priority == priority)
+    ]
+    total = sum(count for _, count in matching)
+    done = sum(count for row_status, count in matching if row_status == TaskStatus.done)
+    return total, done
+
+
+@traced("task_list_stats.count_from_tasks")
+def count_from_tasks(db: Session, list_id: int) -> Counter:
+    """Count the hot and archived tasks of a list per ``(status, priority)``."""
+    counts: Counter = Counter()
+    for model in (TaskModel, ArchivedTaskModel):
+        for task_status, priority, count in (
+            db.query(model.status, model.priority, func.count(model.id))
+            .filter(model.list_id == list_id)
+            .group_by(model.status, model.priority)
+        ):
+            counts[(task_status, priority)] += count
+    return counts
+
+
+@traced("task_list_stats.recount_list")
+def recount_list(db: Session, list_id: int) -> bool | None:
+    """
+    Rebuild the counters of a list from its hot and archived tasks. Commits.
+
+    Locking the counters first makes concurrent task writes wait, so none
+    is lost or counted twice.
+
+    Returns:
+        bool | None: Whether a counter was wrong or missing, or None if the
+        list does not exist.
+    """
+    exists = (
+        db.query(TaskListModel.id)
+        .filter(TaskListModel.id == list_id)
+        .with_for_update()
+        .scalar()
+    )
+    if exists is None:
+        db.rollback()
+        return None
+    stored = {
+        (row.status, row.priority): row
+        for row in db.query(TaskListStatsModel)
+        .filter(TaskListStatsModel.list_id == list_id)
+        .with_for_update()
+    }
+    actual = count_from_tasks(db, list_id)
+
+    repaired = False
+    for key in COMBINATIONS:
+        row = stored.get(key)
+        if row is None:
+            db.add(
+                TaskListStatsModel(
+                    list_id=list_id, status=key[0], priority=key[1], count=actual[key]
+                )
+            )
+            repaired = True
+        elif row.count != actual[key]:
+            row.count = actual[key]
+            repaired = True
+    db.commit()
+    return repaired
+
+
+def recount_all(db: Session, batch_size: int = 500) -> tuple[int, int]:
+    """
+    Recount every list, one transaction per list.
+
+    Returns:
+        tuple[int, int]: Lists checked and lists repaired.
+    """
+    checked = repaired = 0
+    after_id = 0
+    while True:
+        list_ids = db.scalars(
+            select(TaskListModel.id)
+            .where(TaskListModel.id > after_id)
+            .order_by(TaskListModel.id)
+            .limit(batch_size)
+        ).all()
+        for list_id in list_ids:
+            result = recount_list(db, list_id)
+            if result is not None:
+                checked += 1
+                repaired += result
+        if len(list_ids) < batch_size:
+            return checked, repaired
+        after_id = list_ids[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recount the per-list task stats.")
+    parser.add_argument("--list-id", type=int, help="Only recount this list.")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.list_id is None:
+            checked, repaired = recount_all(db)
+        else:
+            result = recount_list(db, args.list_id)
+            if result is None:
+                parser.error(f"list {args.list_id} does not exist")
+            checked, repaired = 1, int(result)
+    print(f"checked {checked} lists, repaired {repaired}")
+
+
+if __name__ == "__main__":
+    main()
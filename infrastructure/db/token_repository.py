@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from infrastructure.db.database import SessionLocal
+from infrastructure.db.models import RevokedTokenModel, utcnow
+from utils.revocation import revocation_cache
+from utils.tracing import traced
+
+
+@traced("token_repository.revoke_token")
+def revoke_token(db: Session, jti: str, expires_at: float):
+    """
+    Persist the revocation of a token and add it to this process' cache.
+
+    Args:
+        jti (str): ID of the token.
+        expires_at (float): ``exp`` claim of the token (UNIX timestamp).
+    """
+    # Revocations are rare, so expired rows are cleaned up here
+    db.query(RevokedTokenModel).filter(RevokedTokenModel.expires_at <= utcnow()).delete(
+        synchronize_session=False
+    )
+    db.add(
+        RevokedTokenModel(
+            jti=jti,
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc).replace(
+                tzinfo=None
+            ),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Already revoked
+        db.rollback()
+    revocation_cache.add(jti, expires_at)
+
+
+@traced("token_repository.get_active_revocations")
+def get_active_revocations(db: Session) -> list[tuple[str, datetime]]:
+    return (
+        db.query(RevokedTokenModel.jti, RevokedTokenModel.expires_at)
+        .filter(RevokedTokenModel.expires_at > utcnow())
+        .all()
+    )
+
+
+def load_active_revocations() -> dict[str, float]:
+    """Loader of the revocation cache: ``jti`` to expiry as a UNIX timestamp."""
+    with SessionLocal() as db:
+        return {
+            jti: expires_at.replace(tzinfo=timezone.utc).timestamp()
+            for jti, expires_at in get_active_revocations(db)
+        }
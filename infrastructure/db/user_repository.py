@@ -1,14 +1,17 @@
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from infrastructure.db.models import UserModel
+from utils.tracing import traced
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@traced("user_repository.get_user_by_username")
 def get_user_by_username(db: Session, username: str):
     return db.query(UserModel).filter(UserModel.username == username).first()
 
 
+@traced("user_repository.create_user")
 def create_user(db: Session, username: str, password: str):
     hashed_password = pwd_context.hash(password)
     user = UserModel(username=username, password_hash=hashed_password)
@@ -18,5 +21,6 @@ def create_user(db: Session, username: str, password: str):
     return user
 
 
+@traced("user_repository.verify_password")
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import os
+import secrets
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EVENTS_HISTORY_SIZE = int(os.getenv("EVENTS_HISTORY_SIZE", "256"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "64"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_MAX_LISTS = int(os.getenv("EVENTS_MAX_LISTS", "1024"))
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    generation: str
+    sequence: int
+    list_id: int
+    type: str
+    data: dict
+
+    @property
+    def id(self) -> str:
+        """Event id sent to clients: ``<generation>-<sequence>``."""
+        return f"{self.generation}-{self.sequence}"
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    list_id: int
+    queue: asyncio.Queue
+    generation: str = ""
+    last_id: int = 0
+    overflowed: bool = False
+    backlog: list = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class _ListLog:
+    """Sequence and recent events of one list."""
+
+    generation: str
+    history: deque
+    sequence: int = 0
+
+
+class TaskEventBroker:
+    """
+    In-process fan-out of task change events, keyed by task list.
+
+    Repositories publish from the threadpool after each commit; subscribers
+    are asyncio queues living on the event loop, so an idle subscriber costs
+    one small queue and no thread. Every list keeps a bounded history so a
+    reconnecting client can resume from its ``Last-Event-ID``.
+
+    Only the ``max_lists`` most recently used lists keep a history; lists
+    without subscribers are evicted first. Each new history gets a new
+    generation, made of a random boot id and a counter, and event ids carry
+    it. An id from an evicted history or an earlier process is answered
+    with ``resync`` instead of replaying unrelated events.
+    """
+
+    def __init__(
+        self,
+        history_size: int = EVENTS_HISTORY_SIZE,
+        queue_size: int = EVENTS_QUEUE_SIZE,
+        max_lists: int = EVENTS_MAX_LISTS,
+    ):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.max_lists = max_lists
+        self._boot = secrets.token_hex(4)
+        self._generations = 0
+        self._lock = threading.Lock()
+        self._logs: OrderedDict[int, _ListLog] = OrderedDict()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def publish(self, list_id: int, event_type: str, data: dict) -> TaskEvent:
+        """
+        Record an event for a list and schedule its delivery to subscribers.
+
+        Safe to call from any thread.
+
+        Args:
+            list_id (int): The task list the event belongs to.
+            event_type (str): Event name, e.g. ``task.created``.
+            data (dict): JSON-serializable payload.
+
+        Returns:
+            TaskEvent: The stored event with its per-list sequence number.
+        """
+        with self._lock:
+            log = self._log(list_id)
+            log.sequence += 1
+            event = TaskEvent(
+                generation=log.generation,
+                sequence=log.sequence,
+                list_id=list_id,
+                type=event_type,
+                data=data,
+            )
+            log.history.append(event)
+            loop = self._loop if self._subscribers.get(list_id) else None
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, event)
+        return event
+
+    def forget(self, list_id: int):
+        """Drop the history of a deleted list."""
+        with self._lock:
+            self._logs.pop(list_id, None)
+
+    def subscribe(self, list_id: int, last_event_id: str | None = None) -> Subscription:
+        """
+        Register a subscriber for a list. Must be called on the event loop.
+
+        Args:
+            list_id (int): The task list to follow.
+            last_event_id (str, optional): Last event id seen by the client.
+            Events after it are replayed from history when still available.
+
+        Returns:
+            Subscription: Handle to pass to ``stream`` and ``unsubscribe``.
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            list_id=list_id, queue=asyncio.Queue(maxsize=self.queue_size)
+        )
+        with self._lock:
+            log = self._log(list_id)
+            subscription.generation = log.generation
+            subscription.last_id = log.sequence
+            if last_event_id is not None:
+                subscription.backlog = self._replay(list_id, last_event_id)
+            self._subscribers.setdefault(list_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.list_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.list_id]
+
+    def subscriber_count(self, list_id: int) -> int:
+        with self._lock:
+            return len(self._subscribers.get(list_id, ()))
+
+    async def stream(self, subscription: Subscription, heartbeat: float | None = None):
+        """
+        Yield events for a subscription, or ``None`` as a keep-alive tick.
+
+        The stream ends when the subscriber falls ``queue_size`` events
+        behind; the client is expected to reconnect with its last event id.
+        """
+        for event in subscription.backlog:
+            yield event
+        subscription.backlog = []
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event is None:
+                return
+            if (
+                event.generation == subscription.generation
+                and event.sequence <= subscription.last_id
+            ):
+                continue
+            subscription.generation = event.generation
+            subscription.last_id = event.sequence
+            yield event
+
+    def _log(self, list_id: int) -> _ListLog:
+        """The log of a list, created when missing. Caller holds the lock."""
+        log = self._logs.get(list_id)
+        if log is not None:
+            self._logs.move_to_end(list_id)
+            return log
+        log = self._logs[list_id] = _ListLog(
+            generation=f"{self._boot}.{self._generations}",
+            history=deque(maxlen=self.history_size),
+        )
+        self._generations += 1
+        if len(self._logs) > self.max_lists:
+            # Least recently used first; lists being followed are kept
+            for idle_id in list(self._logs):
+                if len(self._logs) <= self.max_lists:
+                    break
+                if idle_id != list_id and not self._subscribers.get(idle_id):
+                    del self._logs[idle_id]
+        return log
+
+    def _replay(self, list_id: int, last_event_id: str) -> list[TaskEvent]:
+        log = self._logs[list_id]
+        generation, _, sequence = last_event_id.rpartition("-")
+        if generation == log.generation and sequence.isdigit():
+            last_sequence = int(sequence)
+            if last_sequence == log.sequence:
+                return []
+            expired = not log.history or log.history[0].sequence > last_sequence + 1
+            if last_sequence < log.sequence and not expired:
+                return [
+                    event for event in log.history if event.sequence > last_sequence
+                ]
+        resync = TaskEvent(
+            generation=log.generation,
+            sequence=log.sequence,
+            list_id=list_id,
+            type="resync",
+            data={"reason": "history_expired"},
+        )
+        return [resync]
+
+    def _fan_out(self, event: TaskEvent):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.list_id, ()))
+        for subscription in subscribers:
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop_slow_consumer(subscription)
+
+    def _drop_slow_consumer(self, subscription: Subscription):
+        subscription.overflowed = True
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+
+task_event_broker = TaskEventBroker()
@@ -1,13 +1,60 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from infrastructure.api.admin_routes import router_admin as admin_router
+from infrastructure.api.compression import CompressionMiddleware
 from infrastructure.api.task_routes import router as task_router
 from infrastructure.api.user_routes import router_users as users_router
 from infrastructure.db.database import engine
 from infrastructure.db.models import Base
+from infrastructure.db.status_write_behind import status_write_behind
+from infrastructure.db.task_archiver import TASK_ARCHIVE_ENABLED, task_archiver
+from infrastructure.db.token_repository import load_active_revocations
+from utils.profiler import PROFILING_ENABLED, ProfilingMiddleware
+from utils.revocation import revocation_cache
+from utils.tracing import (
+    TracedJSONResponse,
+    TracingMiddleware,
+    instrument_engine,
+    tracer,
+)
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="TASK_TRACKING API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    revocation_cache.start(load_active_revocations)
+    if status_write_behind is not None:
+        status_write_behind.start()
+    if TASK_ARCHIVE_ENABLED:
+        task_archiver.start()
+    yield
+    if TASK_ARCHIVE_ENABLED:
+        task_archiver.stop()
+    # Flush acknowledged status changes before the process exits
+    if status_write_behind is not None:
+        status_write_behind.stop()
+    revocation_cache.stop()
+    if tracer.enabled:
+        tracer.shutdown()
+
+
+app = FastAPI(
+    title="TASK_TRACKING API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=TracedJSONResponse if tracer.enabled else JSONResponse,
+)
+
+app.add_middleware(CompressionMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if tracer.enabled:
+    instrument_engine(engine)
+    app.add_middleware(TracingMiddleware)
 
 # Endpoints definitions
 app.include_router(task_router)
 app.include_router(users_router)
+app.include_router(admin_router)
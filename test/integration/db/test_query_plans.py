@@ -0,0 +1,332 @@
+"""
+Query plan regression tests.
+
+Every SQL statement emitted by the repositories is captured while they run
+against a seeded database, then explained. A statement fails the test when
+its plan reads a whole table that holds more than QUERY_PLAN_MAX_SCAN_ROWS
+rows, which almost always means an index is missing. Sorted task pages must
+also come out of an index already ordered, without a sort step.
+
+Runs on in-memory SQLite by default; point QUERY_PLAN_DATABASE_URL at an
+empty MySQL schema to check the production planner instead.
+"""
+
+import os
+import re
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from infrastructure.db.database import Base
+from infrastructure.db.models import (
+    ArchivedTaskModel,
+    TaskListModel,
+    TaskModel,
+    UserModel,
+    utcnow,
+)
+from infrastructure.db.repositories import TaskListRepository, TaskRepository
+from infrastructure.db.task_archiver import TaskArchiver
+from infrastructure.db import task_list_stats, user_repository
+from utils.fractional_index import evenly_spaced_keys
+from application.schemas import (
+    TaskCreate,
+    TaskListUpdate,
+    TaskPriority,
+    TaskStatus,
+    parse_task_sort,
+)
+
+pytestmark = pytest.mark.integration
+
+QUERY_PLAN_DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL", "sqlite://")
+QUERY_PLAN_MAX_SCAN_ROWS = int(os.getenv("QUERY_PLAN_MAX_SCAN_ROWS", "1000"))
+
+SEED_LISTS = 200
+SEED_TASKS_PER_LIST = 20
+SEED_USERS = 1500
+SEED_ARCHIVED_PER_LIST = 10
+# Far above the hot IDs, which keep growing during the tests
+SEED_ARCHIVED_FIRST_ID = 1_000_000
+
+STATUSES = list(TaskStatus)
+PRIORITIES = list(TaskPriority)
+RANKS = evenly_spaced_keys(SEED_TASKS_PER_LIST)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    if QUERY_PLAN_DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(
+            QUERY_PLAN_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(QUERY_PLAN_DATABASE_URL)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    _seed(engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def captured(engine):
+    """Collect the (statement, parameters) pairs executed during a test."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE")
+        ):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _seed(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(TaskListModel),
+            [{"id": i, "name": f"Lista {i}"} for i in range(1, SEED_LISTS + 1)],
+        )
+        conn.execute(
+            insert(TaskModel),
+            [
+                {
+                    "list_id": list_id,
+                    "title": f"Tarea {list_id}-{n}",
+                    "description": "seed",
+                    "status": STATUSES[n % len(STATUSES)],
+                    "priority": PRIORITIES[n % len(PRIORITIES)],
+                    "rank": RANKS[n],
+                }
+                for list_id in range(1, SEED_LISTS + 1)
+                for n in range(SEED_TASKS_PER_LIST)
+            ],
+        )
+        conn.execute(
+            insert(ArchivedTaskModel),
+            [
+                {
+                    "id": SEED_ARCHIVED_FIRST_ID + list_id * SEED_ARCHIVED_PER_LIST + n,
+                    "list_id": list_id,
+                    "title": f"Archivada {list_id}-{n}",
+                    "status": TaskStatus.done,
+                    "priority": PRIORITIES[n % len(PRIORITIES)],
+                    "updated_at": utcnow(),
+                }
+                for list_id in range(1, SEED_LISTS + 1)
+                for n in range(SEED_ARCHIVED_PER_LIST)
+            ],
+        )
+        conn.execute(
+            insert(UserModel),
+            [
+                {"username": f"user{i}", "password_hash": "seed"}
+                for i in range(SEED_USERS)
+            ],
+        )
+    with sessionmaker(bind=engine)() as db:
+        task_list_stats.recount_all(db)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+        else:
+            for table in Base.metadata.sorted_tables:
+                conn.exec_driver_sql(f"ANALYZE TABLE {table.name}")
+
+
+def _table_rows(conn) -> dict[str, int]:
+    return {
+        table.name: conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table.name}").scalar()
+        for table in Base.metadata.sorted_tables
+    }
+
+
+def _full_scans(conn, statement, parameters) -> list[str]:
+    """Return the tables read in full by a statement, according to EXPLAIN."""
+    if conn.dialect.name == "sqlite":
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        tables = []
+        for row in plan:
+            match = re.match(r"SCAN (\w+)", row.detail)
+            if match:
+                tables.append(match.group(1))
+        return tables
+
+    plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings()
+    return [row["table"] for row in plan if row["type"] in ("ALL", "index")]
+
+
+def _sorts(conn, statement, parameters) -> bool:
+    """Whether the plan of a statement sorts rows instead of reading an index."""
+    if conn.dialect.name == "sqlite":
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return any(re.search(r"TEMP B-TREE FOR .*ORDER BY", row.detail) for row in plan)
+
+    plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings()
+    return any("filesort" in (row["Extra"] or "") for row in plan)
+
+
+def assert_no_full_scans(engine, captured):
+    # Snapshot first: the row counts below go through the same engine
+    statements = list(captured)
+    assert statements, "the scenario did not run any query"
+    offenders = []
+    with engine.connect() as conn:
+        rows = _table_rows(conn)
+        for statement, parameters in statements:
+            for table in _full_scans(conn, statement, parameters):
+                if rows.get(table, 0) > QUERY_PLAN_MAX_SCAN_ROWS:
+                    offenders.append(
+                        f"full scan of {table} ({rows[table]} rows):\n{statement}"
+                    )
+    assert not offenders, "\n\n".join(offenders)
+
+
+def test_task_list_repository_queries_use_indexes(engine, db, captured):
+    repo = TaskListRepository(db)
+    created = repo.create_list("Nueva lista")
+    repo.get_list(1)
+    repo.update_name_list(created.id, TaskListUpdate(name="Renombrada"))
+    repo.get_all_lists()
+    repo.get_lists_summary(after_id=0, limit=50)
+    repo.get_lists_summary(after_id=150, limit=50)
+    repo.delete_list(created.id)
+    repo.delete_list(SEED_LISTS)
+
+    assert_no_full_scans(engine, captured)
+
+
+def _follows(repo, task_id, previous_id):
+    ids = [task.id for task in repo.get_tasks_by_list(1)]
+    return ids.index(task_id) == ids.index(previous_id) + 1
+
+
+def test_task_repository_queries_use_indexes(engine, db, captured):
+    repo = TaskRepository(db)
+    task = repo.create_task(
+        list_id=1,
+        title="Nueva",
+        description="Nueva tarea",
+        status=TaskStatus.pending,
+        priority=TaskPriority.high,
+    )
+    repo.get_task(task.id)
+    repo.update_task(
+        task.id,
+        TaskCreate(title="Editada", description="Editada", priority=TaskPriority.low),
+    )
+    repo.update_task_status(task.id, TaskStatus.done)
+    repo.get_tasks_by_list(2)
+    repo.get_tasks_by_list(2, status_task=TaskStatus.pending)
+    repo.get_tasks_by_list(2, priority=TaskPriority.high)
+    repo.get_tasks_by_list(2, TaskStatus.done, TaskPriority.low)
+    repo.get_tasks_by_list(2, fields=("id", "status"))
+    repo.get_tasks_by_list(2, include_archived=True)
+    repo.get_tasks_by_list(2, TaskStatus.done, include_archived=True)
+    repo.count_tasks(2)
+    repo.count_tasks(2, priority=TaskPriority.high)
+    repo.count_tasks(2, TaskStatus.done, TaskPriority.low)
+    repo.get_tasks_by_ids([1, 50, 999, task.id])
+    repo.get_tasks_by_ids([1, 999, SEED_ARCHIVED_FIRST_ID], include_archived=True)
+    repo.move_task(task.id, after_id=3, before_id=None)
+    assert _follows(repo, task.id, 3)
+    repo.move_task(task.id, after_id=None, before_id=1)
+    assert _follows(repo, 1, task.id)
+    repo.move_task(task.id, after_id=4, before_id=5)
+    assert _follows(repo, task.id, 4) and _follows(repo, 5, task.id)
+    repo.rebalance_list(1)
+    repo.delete_task(task.id)
+
+    assert_no_full_scans(engine, captured)
+
+
+@pytest.mark.parametrize(
+    "sort, status_task, priority",
+    [
+        ("rank", None, None),
+        ("-id", None, None),
+        ("-priority", None, None),
+        ("-priority", TaskStatus.pending, None),
+        ("status,priority", None, None),
+        ("status,title", None, None),
+        ("title", TaskStatus.done, None),
+        ("rank", None, TaskPriority.high),
+    ],
+)
+def test_sorted_task_pages_use_indexes(
+    engine, db, captured, sort, status_task, priority
+):
+    repo = TaskRepository(db)
+    pinned = tuple(
+        name
+        for name, value in (("status", status_task), ("priority", priority))
+        if value
+    )
+    columns, descending = parse_task_sort(sort, pinned)
+    every_task = repo.get_tasks_by_list(
+        3, status_task, priority, sort=columns, descending=descending
+    )
+
+    pages, after = [], None
+    while True:
+        page = repo.get_tasks_by_list(
+            3,
+            status_task,
+            priority,
+            sort=columns,
+            descending=descending,
+            after=after,
+            limit=4,
+        )
+        pages.extend(page)
+        if len(page) < 4:
+            break
+        after = [getattr(page[-1], name) for name in columns]
+    assert [task.id for task in pages] == [task.id for task in every_task]
+
+    assert_no_full_scans(engine, captured)
+    with engine.connect() as conn:
+        sorted_reads = [
+            statement
+            for statement, parameters in captured
+            if "ORDER BY" in statement and _sorts(conn, statement, parameters)
+        ]
+    assert not sorted_reads, "\n\n".join(sorted_reads)
+
+
+def test_user_repository_queries_use_indexes(engine, db, captured):
+    user_repository.create_user(db, "query_plan_user", "secret")
+    user_repository.get_user_by_username(db, "user10")
+    user_repository.get_user_by_username(db, "missing")
+
+    assert_no_full_scans(engine, captured)
+
+
+def test_task_list_stats_queries_use_indexes(engine, db, captured):
+    task_list_stats.recount_list(db, 5)
+    task_list_stats.recount_all(db, batch_size=100)
+    task_list_stats.count_tasks(db, 5, TaskStatus.done)
+
+    assert_no_full_scans(engine, captured)
+
+
+def test_task_archiver_queries_use_indexes(engine, captured):
+    archiver = TaskArchiver(sessionmaker(bind=engine), after_days=-1, batch_size=10)
+    assert archiver.archive_batch() == 10
+
+    assert_no_full_scans(engine, captured)
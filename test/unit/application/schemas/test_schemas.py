@@ -6,6 +6,11 @@ from application.schemas import (
     TaskOut,
     UserCreate,
     Token,
+    decode_task_cursor,
+    encode_task_cursor,
+    parse_task_fields,
+    parse_task_sort,
+    task_list_fieldset_response,
 )
 from pydantic import ValidationError
 
@@ -66,3 +71,80 @@ def test_user_create():
 def test_token_model():
     token = Token(access_token="abxxymdjueuQpd")
     assert token.token_type == "bearer"
+
+
+def test_parse_task_fields_keeps_declaration_order_and_id():
+    assert parse_task_fields("status, title") == ("id", "title", "status")
+    assert parse_task_fields("id,status,status") == ("id", "status")
+
+
+def test_parse_task_fields_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="Unknown task fields: owner"):
+        parse_task_fields("status,owner")
+
+
+def test_task_list_fieldset_response_only_serializes_requested_fields():
+    response_model = task_list_fieldset_response(("id", "status"))
+    response = response_model(
+        tasks=[{"id": 1, "status": TaskStatus.done}], completion="100%"
+    )
+    assert response.model_dump(mode="json") == {
+        "tasks": [{"id": 1, "status": "done"}],
+        "completion": "100%",
+        "next_cursor": None,
+    }
+    assert task_list_fieldset_response(("id", "status")) is response_model
+
+
+def test_parse_task_sort_appends_id_and_drops_pinned_fields():
+    assert parse_task_sort("-priority") == (("priority", "id"), True)
+    assert parse_task_sort("status,title", pinned=("status",)) == (
+        ("title", "id"),
+        False,
+    )
+    assert parse_task_sort("priority,id,title") == (("priority", "id"), False)
+
+
+@pytest.mark.parametrize(
+    "raw, message",
+    [
+        ("owner", "Unknown sort fields: owner"),
+        ("priority,-id", "same direction"),
+        ("title", "Unsupported sort: title"),
+    ],
+)
+def test_parse_task_sort_rejects_orders_without_an_index(raw, message):
+    with pytest.raises(ValueError, match=message):
+        parse_task_sort(raw)
+
+
+def test_task_cursor_round_trip_and_sort_check():
+    cursor = encode_task_cursor(("priority", "id"), True, [TaskPriority.high, 7])
+    assert decode_task_cursor(cursor, ("priority", "id"), True) == ["high", 7]
+    with pytest.raises(ValueError, match="another sort"):
+        decode_task_cursor(cursor, ("priority", "id"), False)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_task_cursor("not-a-cursor", ("id",), False)
+
+
+@pytest.mark.parametrize(
+    "columns, values",
+    [
+        (("status", "priority", "id"), ["bogus", "low", 1]),
+        (("status", "priority", "id"), [None, "low", 1]),
+        (("priority", "id"), ["high", "7"]),
+        (("priority", "id"), ["high", True]),
+        (("id",), [{"id": 1}]),
+        (("status", "title", "id"), ["done", None, 1]),
+        (("rank", "id"), [["a0"], 1]),
+    ],
+)
+def test_task_cursor_rejects_values_of_the_wrong_type(columns, values):
+    cursor = encode_task_cursor(columns, False, values)
+    with pytest.raises(ValueError, match="Invalid cursor value"):
+        decode_task_cursor(cursor, columns, False)
+
+
+def test_task_cursor_accepts_a_null_rank():
+    cursor = encode_task_cursor(("rank", "id"), False, [None, 3])
+    assert decode_task_cursor(cursor, ("rank", "id"), False) == [None, 3]
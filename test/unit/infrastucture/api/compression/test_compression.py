@@ -0,0 +1,81 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from infrastructure.api.compression import CompressionMiddleware, negotiate_encoding
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/large")
+def large():
+    return {"tasks": [{"id": i, "status": "pending"} for i in range(100)]}
+
+
+@app.get("/small")
+def small():
+    return {"id": 1}
+
+
+@app.get("/plain")
+def plain():
+    return PlainTextResponse("x" * 1000, headers={"Content-Encoding": "identity"})
+
+
+@app.get("/stream")
+def stream():
+    chunks = (f"data: {i}\n\n" for i in range(3))
+    return StreamingResponse(chunks, media_type="text/event-stream")
+
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, identity", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, available=["gzip"]) == expected
+
+
+def test_negotiate_encoding_prefers_highest_weight():
+    assert negotiate_encoding("gzip, br;q=0.5", available=["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip, br", available=["br", "gzip"]) == "br"
+
+
+def test_large_response_is_gzipped():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["tasks"]) == 100
+
+
+def test_small_response_is_not_compressed():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"id": 1}
+
+
+def test_already_encoded_response_is_untouched():
+    response = client.get("/plain", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "identity"
+
+
+def test_streaming_response_is_compressed_per_chunk():
+    with client.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
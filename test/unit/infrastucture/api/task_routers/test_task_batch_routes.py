@@ -0,0 +1,90 @@
+from datetime import timedelta
+import pytest
+from sqlalchemy import update
+from infrastructure.db import repositories
+from infrastructure.db.models import TaskModel, utcnow
+from infrastructure.db.task_archiver import TaskArchiver
+
+
+@pytest.fixture
+def task_ids(db_client):
+    list_id = db_client.post("/tasklists/", json={"name": "Lista"}).json()["id"]
+    return [
+        db_client.post(
+            f"/tasklists/{list_id}/tasks",
+            json={"title": title, "description": f"Tarea {title}"},
+        ).json()["id"]
+        for title in ("Uno", "Dos", "Tres")
+    ]
+
+
+def test_get_tasks_by_ids_keeps_request_order(db_client, task_ids):
+    first, second, third = task_ids
+    response = db_client.get(f"/tasklists/tasks?ids={third},{first},{second}")
+
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()["tasks"]] == [third, first, second]
+    assert response.json()["missing"] == []
+
+
+def test_batch_reports_missing_ids_in_request_order(db_client, task_ids):
+    response = db_client.post(
+        "/tasklists/tasks/batch", json={"ids": [999, task_ids[1], 998]}
+    )
+
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()["tasks"]] == [task_ids[1]]
+    assert response.json()["missing"] == [999, 998]
+
+
+def test_batch_ignores_duplicate_ids(db_client, task_ids):
+    first, second, _ = task_ids
+    response = db_client.get(f"/tasklists/tasks?ids={second},{first},{second},999,999")
+
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()["tasks"]] == [second, first]
+    assert response.json()["missing"] == [999]
+
+
+def test_batch_rejects_more_than_the_max_size(db_client, task_ids, monkeypatch):
+    monkeypatch.setattr(repositories, "TASK_BATCH_MAX_SIZE", 2)
+
+    response = db_client.post("/tasklists/tasks/batch", json={"ids": task_ids})
+    assert response.status_code == 400
+    response = db_client.get("/tasklists/tasks?ids=" + ",".join(map(str, task_ids)))
+    assert response.status_code == 400
+    # Duplicates do not count towards the limit
+    response = db_client.post("/tasklists/tasks/batch", json={"ids": task_ids[:2] * 3})
+    assert response.status_code == 200
+
+
+def test_get_tasks_by_ids_rejects_non_integer_ids(db_client):
+    response = db_client.get("/tasklists/tasks?ids=1,dos")
+
+    assert response.status_code == 400
+
+
+def test_batch_tells_archived_tasks_from_deleted_ones(
+    db_client, session_factory, task_ids
+):
+    archived, deleted, kept = task_ids
+    with session_factory() as db:
+        db.execute(
+            update(TaskModel)
+            .where(TaskModel.id == archived)
+            .values(status="done", updated_at=utcnow() - timedelta(days=90))
+        )
+        db.commit()
+    TaskArchiver(session_factory, after_days=30).run_once()
+    db_client.delete(f"/tasklists/tasks/{deleted}")
+
+    response = db_client.post("/tasklists/tasks/batch", json={"ids": task_ids})
+    assert response.json()["missing"] == [archived, deleted]
+    response = db_client.post(
+        "/tasklists/tasks/batch?include_archived=true", json={"ids": task_ids}
+    )
+    assert [task["id"] for task in response.json()["tasks"]] == [archived, kept]
+    assert response.json()["missing"] == [deleted]
+    ids = ",".join(map(str, task_ids))
+    response = db_client.get(f"/tasklists/tasks?ids={ids}&include_archived=true")
+    assert response.json()["missing"] == [deleted]
@@ -0,0 +1,71 @@
+import pytest
+from infrastructure.api import task_routes
+from infrastructure.db.models import TaskModel
+
+
+@pytest.fixture
+def task_ids(db_client):
+    list_id = db_client.post("/tasklists/", json={"name": "Lista"}).json()["id"]
+    return [
+        db_client.post(
+            f"/tasklists/{list_id}/tasks",
+            json={"title": title, "description": f"Tarea {title}"},
+        ).json()["id"]
+        for title in ("Uno", "Dos", "Tres", "Cuatro")
+    ]
+
+
+def _order(db_client, list_id=1):
+    tasks = db_client.get(f"/tasklists/{list_id}/tasks").json()["tasks"]
+    return [task["id"] for task in tasks]
+
+
+def test_move_returns_the_task_with_its_new_rank(db_client, task_ids):
+    first, second, third, _ = task_ids
+    response = db_client.patch(
+        f"/tasklists/tasks/{third}/move",
+        json={"after_id": first, "before_id": second},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == third
+    assert _order(db_client)[:3] == [first, third, second]
+
+
+@pytest.mark.parametrize(
+    "body, status_code",
+    [
+        ({}, 400),
+        ({"after_id": "self"}, 400),
+        ({"after_id": "first", "before_id": "fourth"}, 409),
+        ({"after_id": 999}, 404),
+    ],
+)
+def test_move_errors(db_client, task_ids, body, status_code):
+    first, second, _, fourth = task_ids
+    names = {"self": second, "first": first, "fourth": fourth}
+    body = {key: names.get(value, value) for key, value in body.items()}
+
+    response = db_client.patch(f"/tasklists/tasks/{second}/move", json=body)
+    assert response.status_code == status_code
+    assert _order(db_client) == task_ids
+
+
+def test_long_ranks_trigger_a_background_rebalance(
+    db_client, session_factory, task_ids, monkeypatch
+):
+    monkeypatch.setattr(task_routes, "TASK_RANK_REBALANCE_LENGTH", 1)
+    monkeypatch.setattr(task_routes, "SessionLocal", session_factory)
+    first, second, third, _ = task_ids
+
+    moved = db_client.patch(
+        f"/tasklists/tasks/{third}/move",
+        json={"after_id": first, "before_id": second},
+    ).json()
+
+    assert len(moved["rank"]) > 1
+    with session_factory() as db:
+        ranks = dict(db.query(TaskModel.id, TaskModel.rank))
+    # The rebalance ran after the response: every rank is short again
+    assert all(len(rank) <= 2 for rank in ranks.values())
+    assert sorted(ranks, key=ranks.get)[:3] == [first, third, second]
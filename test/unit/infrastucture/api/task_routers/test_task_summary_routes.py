@@ -0,0 +1,73 @@
+import pytest
+
+
+def _create_lists(db_client, count):
+    return [
+        db_client.post("/tasklists/", json={"name": f"Lista {number}"}).json()["id"]
+        for number in range(count)
+    ]
+
+
+def _walk(db_client, limit):
+    pages = []
+    after_id = 0
+    while after_id is not None:
+        response = db_client.get(
+            f"/tasklists/summary?after_id={after_id}&limit={limit}"
+        )
+        assert response.status_code == 200
+        page = response.json()
+        pages.append([summary["id"] for summary in page["lists"]])
+        after_id = page["next_after_id"]
+    return pages
+
+
+def test_summary_walks_every_page(db_client):
+    first, second, third, fourth, fifth = _create_lists(db_client, 5)
+
+    assert _walk(db_client, 2) == [[first, second], [third, fourth], [fifth]]
+
+
+def test_full_last_page_is_followed_by_an_empty_one(db_client):
+    first, second, third, fourth = _create_lists(db_client, 4)
+
+    assert _walk(db_client, 2) == [[first, second], [third, fourth], []]
+
+
+def test_next_after_id_is_the_last_id_of_the_page(db_client):
+    list_ids = _create_lists(db_client, 3)
+
+    page = db_client.get(f"/tasklists/summary?after_id={list_ids[0]}&limit=1").json()
+    assert [summary["id"] for summary in page["lists"]] == [list_ids[1]]
+    assert page["next_after_id"] == list_ids[1]
+    page = db_client.get(f"/tasklists/summary?after_id={list_ids[-1]}").json()
+    assert page == {"lists": [], "next_after_id": None}
+
+
+def test_summary_counts_the_tasks_of_each_list(db_client):
+    list_id, empty_id = _create_lists(db_client, 2)
+    for title, task_status in (("Uno", "done"), ("Dos", "pending")):
+        db_client.post(
+            f"/tasklists/{list_id}/tasks",
+            json={"title": title, "description": title, "status": task_status},
+        )
+
+    summaries = db_client.get("/tasklists/summary").json()["lists"]
+    assert summaries[0]["total"] == 2
+    assert summaries[0]["by_status"]["done"] == 1
+    assert summaries[0]["completion"] == "50%"
+    assert summaries[1]["id"] == empty_id
+    assert summaries[1]["total"] == 0
+    assert summaries[1]["completion"] == "0%"
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=1001", "after_id=-1", "limit=dos"])
+def test_summary_rejects_out_of_bounds_parameters(db_client, query):
+    assert db_client.get(f"/tasklists/summary?{query}").status_code == 422
+
+
+def test_summary_accepts_the_limit_bounds(db_client):
+    _create_lists(db_client, 2)
+
+    assert len(db_client.get("/tasklists/summary?limit=1").json()["lists"]) == 1
+    assert len(db_client.get("/tasklists/summary?limit=1000").json()["lists"]) == 2
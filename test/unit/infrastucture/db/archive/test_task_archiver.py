@@ -0,0 +1,89 @@
+from datetime import timedelta
+import pytest
+from infrastructure.db.models import ArchivedTaskModel, TaskListModel, TaskModel, utcnow
+from infrastructure.db import task_archiver
+from infrastructure.db.repositories import TaskRepository
+from infrastructure.db.status_write_behind import StatusWriteBehindQueue
+from infrastructure.db.task_archiver import TaskArchiver
+from application.schemas import TaskStatus
+
+OLD = utcnow() - timedelta(days=90)
+
+
+@pytest.fixture(autouse=True)
+def seed_tasks(session_factory):
+    with session_factory() as db:
+        task_list = TaskListModel(name="Lista")
+        task_list.tasks = [
+            TaskModel(title="Vieja hecha", status=TaskStatus.done, updated_at=OLD),
+            TaskModel(title="Otra vieja", status=TaskStatus.done, updated_at=OLD),
+            TaskModel(title="Nueva hecha", status=TaskStatus.done),
+            TaskModel(title="Vieja pendiente", updated_at=OLD),
+        ]
+        db.add(task_list)
+        db.commit()
+
+
+def _ids(session_factory, model):
+    with session_factory() as db:
+        return sorted(task_id for (task_id,) in db.query(model.id))
+
+
+def test_only_old_done_tasks_are_archived_in_batches(session_factory):
+    archiver = TaskArchiver(session_factory, after_days=30, batch_size=1)
+
+    assert archiver.archive_batch() == 1
+    assert archiver.run_once() == 1
+    assert archiver.run_once() == 0
+    assert _ids(session_factory, TaskModel) == [3, 4]
+    assert _ids(session_factory, ArchivedTaskModel) == [1, 2]
+
+
+def test_queued_tasks_stay_hot_without_shrinking_the_batch(
+    session_factory, monkeypatch
+):
+    queue = StatusWriteBehindQueue(session_factory)
+    monkeypatch.setattr(task_archiver, "status_write_behind", queue)
+    queue.enqueue(1, TaskStatus.pending, 1)
+    archiver = TaskArchiver(session_factory, after_days=30, batch_size=1)
+
+    assert archiver.archive_batch() == 1
+    assert _ids(session_factory, ArchivedTaskModel) == [2]
+    assert archiver.run_once() == 0
+
+
+def test_change_queued_before_archiving_reopens_the_task(session_factory):
+    queue = StatusWriteBehindQueue(session_factory)
+    TaskArchiver(session_factory, after_days=30).run_once()
+    queue.enqueue(1, TaskStatus.in_progress, 1)
+    queue.enqueue(2, TaskStatus.done, 1)
+
+    assert queue.flush() == 2
+    assert _ids(session_factory, TaskModel) == [1, 3, 4]
+    assert _ids(session_factory, ArchivedTaskModel) == [2]
+    with session_factory() as db:
+        assert db.get(TaskModel, 1).status == TaskStatus.in_progress
+
+
+def test_reads_include_the_archive_on_request(session_factory):
+    TaskArchiver(session_factory, after_days=30).run_once()
+
+    with session_factory() as db:
+        repo = TaskRepository(db)
+        assert [task.id for task in repo.get_tasks_by_list(1)] == [3, 4]
+        assert [
+            task.id for task in repo.get_tasks_by_list(1, include_archived=True)
+        ] == [1, 2, 3, 4]
+        assert repo.count_tasks(1) == (4, 3)
+        assert repo.count_tasks(1, TaskStatus.pending) == (1, 0)
+
+
+def test_batch_reads_find_archived_tasks_on_request(session_factory):
+    TaskArchiver(session_factory, after_days=30).run_once()
+
+    with session_factory() as db:
+        repo = TaskRepository(db)
+        assert sorted(task.id for task in repo.get_tasks_by_ids([1, 3, 99])) == [3]
+        assert sorted(
+            task.id for task in repo.get_tasks_by_ids([1, 3, 99], include_archived=True)
+        ) == [1, 3]
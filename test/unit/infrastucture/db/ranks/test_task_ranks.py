@@ -0,0 +1,117 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from infrastructure.db.models import TaskModel
+from infrastructure.db.repositories import (
+    TASK_RANK_MAX_LENGTH,
+    TaskListRepository,
+    TaskRepository,
+)
+from application.schemas import TaskPriority, TaskStatus
+
+
+def _create(repo, list_id, title):
+    return repo.create_task(
+        list_id, title, "d", TaskStatus.pending, TaskPriority.medium
+    )
+
+
+def _titles(db, list_id):
+    return [
+        title
+        for (title,) in db.query(TaskModel.title)
+        .filter(TaskModel.list_id == list_id)
+        .order_by(TaskModel.rank, TaskModel.id)
+    ]
+
+
+def test_create_rebalances_instead_of_overflowing_the_rank(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        repo = TaskRepository(db)
+        first = _create(repo, list_id, "Uno")
+        db.execute(
+            update(TaskModel)
+            .where(TaskModel.id == first.id)
+            .values(rank="z" * TASK_RANK_MAX_LENGTH)
+        )
+        db.commit()
+
+        task = _create(repo, list_id, "Dos")
+        assert len(task.rank) <= 3
+        assert _titles(db, list_id) == ["Uno", "Dos"]
+
+
+@pytest.fixture
+def tasks(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        repo = TaskRepository(db)
+        return list_id, [_create(repo, list_id, title).id for title in "ABCD"]
+
+
+def _move(session_factory, task_id, after_id=None, before_id=None):
+    with session_factory() as db:
+        return TaskRepository(db).move_task(task_id, after_id, before_id)
+
+
+@pytest.mark.parametrize(
+    "move, order",
+    [
+        ({"after": "A"}, "ADBC"),
+        ({"before": "A"}, "DABC"),
+        ({"before": "C"}, "ABDC"),
+        ({"after": "A", "before": "B"}, "ADBC"),
+    ],
+)
+def test_move_places_the_task_between_its_neighbours(
+    session_factory, tasks, move, order
+):
+    list_id, ids = tasks
+    by_title = dict(zip("ABCD", ids))
+    task = _move(
+        session_factory,
+        by_title["D"],
+        after_id=by_title.get(move.get("after")),
+        before_id=by_title.get(move.get("before")),
+    )
+
+    assert task.rank
+    with session_factory() as db:
+        assert "".join(_titles(db, list_id)) == order
+
+
+def test_move_with_stale_neighbours_conflicts(session_factory, tasks):
+    _, (a, b, c, d) = tasks
+
+    with pytest.raises(HTTPException) as error:
+        _move(session_factory, d, after_id=a, before_id=c)
+    assert error.value.status_code == 409
+
+
+def test_move_rejects_invalid_neighbours(session_factory, tasks):
+    _, (a, b, c, d) = tasks
+    with session_factory() as db:
+        other_list_id = TaskListRepository(db).create_list("Otra").id
+        foreign = _create(TaskRepository(db), other_list_id, "Ajena").id
+
+    for after_id, before_id in ((foreign, None), (d, None), (None, None), (c, a)):
+        with pytest.raises(HTTPException) as error:
+            _move(session_factory, d, after_id=after_id, before_id=before_id)
+        assert error.value.status_code == 400
+    with pytest.raises(HTTPException) as error:
+        _move(session_factory, d, after_id=999)
+    assert error.value.status_code == 404
+
+
+def test_move_next_to_an_unranked_task_rebalances_the_list(session_factory, tasks):
+    list_id, (a, b, c, d) = tasks
+    with session_factory() as db:
+        db.execute(update(TaskModel).where(TaskModel.id.in_([a, b])).values(rank=None))
+        db.commit()
+
+    _move(session_factory, d, after_id=a)
+    with session_factory() as db:
+        # Unranked tasks keep their place at the top, by ID
+        assert _titles(db, list_id) == ["A", "D", "B", "C"]
+        assert db.query(TaskModel).filter(TaskModel.rank.is_(None)).count() == 0
@@ -0,0 +1,184 @@
+from datetime import timedelta
+from sqlalchemy import update
+from infrastructure.db import repositories, task_list_stats
+from infrastructure.db.models import TaskListStatsModel, TaskModel, utcnow
+from infrastructure.db.repositories import TaskListRepository, TaskRepository
+from infrastructure.db.status_write_behind import StatusWriteBehindQueue
+from infrastructure.db.task_archiver import TaskArchiver
+from application.use_cases.task_use_cases import TaskListUseCase
+from application.schemas import TaskCreate, TaskPriority, TaskStatus, TaskUpdate
+
+
+def _counters(db, list_id):
+    return {
+        (row.status, row.priority): row.count
+        for row in db.query(TaskListStatsModel).filter_by(list_id=list_id)
+        if row.count
+    }
+
+
+def _create(repo, list_id, title, task_status=TaskStatus.pending):
+    return repo.create_task(list_id, title, "d", task_status, TaskPriority.medium)
+
+
+def test_every_task_write_moves_the_counters(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        repo = TaskRepository(db)
+        first = _create(repo, list_id, "Primera")
+        second = _create(repo, list_id, "Segunda")
+        repo.update_task_status(first.id, TaskStatus.done)
+        repo.update_task(
+            second.id,
+            TaskCreate(title="Editada", description="d", priority=TaskPriority.high),
+        )
+        third = _create(repo, list_id, "Tercera", TaskStatus.in_progress)
+        repo.delete_task(third.id)
+
+        assert _counters(db, list_id) == {
+            (TaskStatus.done, TaskPriority.medium): 1,
+            (TaskStatus.pending, TaskPriority.high): 1,
+        }
+        assert repo.count_tasks(list_id) == (2, 1)
+        assert repo.count_tasks(list_id, priority=TaskPriority.high) == (1, 0)
+        assert task_list_stats.recount_list(db, list_id) is False
+
+
+def test_partial_update_keeps_status_and_priority(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        repo = TaskRepository(db)
+        task = _create(repo, list_id, "Tarea", TaskStatus.in_progress)
+        updated = repo.update_task(task.id, TaskUpdate(title="Renombrada"))
+
+        assert (updated.status, updated.priority) == (
+            TaskStatus.in_progress,
+            TaskPriority.medium,
+        )
+        assert _counters(db, list_id) == {
+            (TaskStatus.in_progress, TaskPriority.medium): 1
+        }
+        assert task_list_stats.recount_list(db, list_id) is False
+
+
+def test_archived_tasks_stay_counted(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        repo = TaskRepository(db)
+        task = _create(repo, list_id, "Hecha", TaskStatus.done)
+        db.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task.id)
+            .values(updated_at=utcnow() - timedelta(days=90))
+        )
+        db.commit()
+
+    assert TaskArchiver(session_factory, after_days=30).run_once() == 1
+    with session_factory() as db:
+        assert TaskRepository(db).count_tasks(list_id) == (1, 1)
+        TaskListRepository(db).delete_list(list_id)
+        assert db.query(TaskListStatsModel).count() == 0
+
+
+def test_write_behind_flush_moves_the_counters(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        task_id = _create(TaskRepository(db), list_id, "Tarea").id
+
+    queue = StatusWriteBehindQueue(session_factory)
+    queue.enqueue(task_id, TaskStatus.in_progress, list_id)
+    queue.enqueue(task_id, TaskStatus.done, list_id)
+    assert queue.flush() == 1
+
+    with session_factory() as db:
+        assert _counters(db, list_id) == {(TaskStatus.done, TaskPriority.medium): 1}
+
+
+def test_legacy_list_read_keeps_loaded_tasks(session_factory):
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Antigua").id
+        db.query(TaskListStatsModel).filter_by(list_id=list_id).delete()
+        _create(TaskRepository(db), list_id, "Hecha", TaskStatus.done)
+        db.execute(update(TaskModel).values(updated_at=utcnow() - timedelta(days=90)))
+        db.commit()
+    TaskArchiver(session_factory, after_days=30).run_once()
+
+    with session_factory() as db:
+        use_case = TaskListUseCase(TaskListRepository(db), TaskRepository(db))
+        response = use_case.list_tasks_with_completion(list_id, include_archived=True)
+        assert [task.title for task in response.tasks] == ["Hecha"]
+        assert response.completion == "100%"
+        summary = use_case.get_lists_summary(after_id=0, limit=10).lists[0]
+        assert (summary.total, summary.completion) == (1, "100%")
+
+
+def test_reads_count_queued_status_changes_without_flushing(
+    session_factory, monkeypatch
+):
+    queue = StatusWriteBehindQueue(session_factory)
+    monkeypatch.setattr(repositories, "status_write_behind", queue)
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        other_id = TaskListRepository(db).create_list("Otra").id
+        repo = TaskRepository(db)
+        task = _create(repo, list_id, "Tarea")
+        _create(repo, list_id, "Otra tarea")
+        other = _create(repo, other_id, "Ajena")
+        repo.update_task_status(task.id, TaskStatus.done)
+        repo.update_task_status(other.id, TaskStatus.in_progress)
+
+        use_case = TaskListUseCase(TaskListRepository(db), repo)
+        summary = use_case.get_lists_summary(after_id=0, limit=10).lists
+        assert summary[0].by_status[TaskStatus.done] == 1
+        assert summary[0].completion == "50%"
+        assert summary[1].by_status[TaskStatus.in_progress] == 1
+        assert repo.count_tasks(list_id) == (2, 1)
+        assert repo.count_tasks(list_id, TaskStatus.pending) == (1, 0)
+        assert repo.count_tasks(other_id, TaskStatus.pending) == (0, 0)
+        # Nothing was written on the read
+        assert queue.snapshot() == {
+            task.id: TaskStatus.done,
+            other.id: TaskStatus.in_progress,
+        }
+        assert _counters(db, list_id) == {(TaskStatus.pending, TaskPriority.medium): 2}
+
+    queue.flush()
+    with session_factory() as db:
+        assert TaskRepository(db).count_tasks(list_id) == (2, 1)
+
+
+def test_filtered_read_flushes_only_its_list(session_factory, monkeypatch):
+    queue = StatusWriteBehindQueue(session_factory)
+    monkeypatch.setattr(repositories, "status_write_behind", queue)
+    with session_factory() as db:
+        list_id = TaskListRepository(db).create_list("Lista").id
+        other_id = TaskListRepository(db).create_list("Otra").id
+        repo = TaskRepository(db)
+        task = _create(repo, list_id, "Tarea")
+        other = _create(repo, other_id, "Ajena")
+        repo.update_task_status(task.id, TaskStatus.done)
+        repo.update_task_status(other.id, TaskStatus.done)
+
+        tasks = repo.get_tasks_by_list(list_id, status_task=TaskStatus.done)
+        assert [each.id for each in tasks] == [task.id]
+        assert queue.snapshot() == {other.id: TaskStatus.done}
+
+
+def test_recount_repairs_drift_and_missing_counters(session_factory):
+    with session_factory() as db:
+        list_repo = TaskListRepository(db)
+        drifted = list_repo.create_list("Desviada").id
+        _create(TaskRepository(db), drifted, "Tarea")
+        db.query(TaskListStatsModel).filter_by(list_id=drifted).update({"count": 7})
+        legacy = list_repo.create_list("Antigua").id
+        db.query(TaskListStatsModel).filter_by(list_id=legacy).delete()
+        _create(TaskRepository(db), legacy, "Tarea", TaskStatus.done)
+        db.commit()
+
+        # Lists without counters are counted on read, without writing
+        assert TaskRepository(db).count_tasks(legacy) == (1, 1)
+        assert TaskRepository(db).count_tasks(legacy, TaskStatus.pending) == (0, 0)
+        assert _counters(db, legacy) == {}
+        assert task_list_stats.recount_all(db) == (2, 2)
+        assert _counters(db, drifted) == {(TaskStatus.pending, TaskPriority.medium): 1}
+        assert task_list_stats.recount_list(db, 999) is None
@@ -0,0 +1,93 @@
+import pytest
+from infrastructure.db.models import TaskListModel, TaskModel
+from infrastructure.db.status_write_behind import StatusWriteBehindQueue
+from application.schemas import TaskStatus
+
+
+@pytest.fixture(autouse=True)
+def seed_tasks(session_factory):
+    with session_factory() as db:
+        task_list = TaskListModel(name="Lista")
+        task_list.tasks = [TaskModel(title=f"Tarea {i}") for i in range(3)]
+        db.add(task_list)
+        db.commit()
+
+
+def _statuses(session_factory):
+    with session_factory() as db:
+        return {task.id: task.status for task in db.query(TaskModel).all()}
+
+
+def test_repeated_updates_are_coalesced(session_factory):
+    queue = StatusWriteBehindQueue(session_factory)
+    queue.enqueue(1, TaskStatus.in_progress, 1)
+    queue.enqueue(1, TaskStatus.done, 1)
+    queue.enqueue(2, TaskStatus.done, 1)
+
+    assert queue.snapshot() == {1: TaskStatus.done, 2: TaskStatus.done}
+    assert queue.flush() == 2
+    assert not queue.has_pending()
+    assert _statuses(session_factory) == {
+        1: TaskStatus.done,
+        2: TaskStatus.done,
+        3: TaskStatus.pending,
+    }
+
+
+def test_discard_drops_pending_change(session_factory):
+    queue = StatusWriteBehindQueue(session_factory)
+    queue.enqueue(3, TaskStatus.done, 1)
+    queue.discard(3)
+
+    assert queue.flush() == 0
+    assert _statuses(session_factory)[3] == TaskStatus.pending
+
+
+def test_stop_flushes_pending_changes(session_factory):
+    queue = StatusWriteBehindQueue(session_factory, window_ms=60_000)
+    queue.start()
+    queue.enqueue(2, TaskStatus.in_progress, 1)
+    queue.stop()
+
+    assert _statuses(session_factory)[2] == TaskStatus.in_progress
+
+
+def test_failed_flush_keeps_changes_for_retry(session_factory):
+    def failing_execute(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    def broken_factory():
+        db = session_factory()
+        db.execute = failing_execute
+        return db
+
+    queue = StatusWriteBehindQueue(broken_factory)
+    queue.enqueue(1, TaskStatus.done, 1)
+    with pytest.raises(RuntimeError):
+        queue.flush()
+
+    assert queue.snapshot() == {1: TaskStatus.done}
+
+
+def test_batch_stays_visible_until_committed(session_factory):
+    queue = StatusWriteBehindQueue(session_factory)
+    seen_before_commit = []
+
+    def recording_factory():
+        db = session_factory()
+        commit = db.commit
+
+        def recording_commit():
+            seen_before_commit.append(queue.snapshot())
+            commit()
+
+        db.commit = recording_commit
+        return db
+
+    queue.session_factory = recording_factory
+    queue.enqueue(1, TaskStatus.done, 1)
+    assert queue.flush() == 1
+
+    assert seen_before_commit == [{1: TaskStatus.done}]
+    assert not queue.has_pending()
+    assert queue.snapshot() == {}
@@ -0,0 +1,119 @@
+import asyncio
+from infrastructure.events.task_event_broker import TaskEventBroker
+
+
+async def _collect(broker, subscription, count):
+    events = []
+    async for event in broker.stream(subscription, heartbeat=0.5):
+        events.append(event)
+        if len(events) == count:
+            break
+    return events
+
+
+def test_publish_fans_out_only_to_list_subscribers():
+    async def scenario():
+        broker = TaskEventBroker()
+        first = broker.subscribe(1)
+        other = broker.subscribe(2)
+        broker.publish(1, "task.created", {"id": 10})
+        events = await _collect(broker, first, 1)
+        assert other.queue.empty()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [(e.sequence, e.type, e.data) for e in events] == [
+        (1, "task.created", {"id": 10})
+    ]
+
+
+def test_subscribe_resumes_after_last_event_id():
+    async def scenario():
+        broker = TaskEventBroker()
+        first, *_ = [
+            broker.publish(1, "task.created", {"id": task_id}) for task_id in range(3)
+        ]
+        subscription = broker.subscribe(1, last_event_id=first.id)
+        return await _collect(broker, subscription, 2)
+
+    events = asyncio.run(scenario())
+    assert [e.sequence for e in events] == [2, 3]
+
+
+def test_subscribe_requests_resync_when_history_expired():
+    async def scenario():
+        broker = TaskEventBroker(history_size=2)
+        first, *_ = [
+            broker.publish(1, "task.created", {"id": task_id}) for task_id in range(5)
+        ]
+        subscription = broker.subscribe(1, last_event_id=first.id)
+        return await _collect(broker, subscription, 1)
+
+    events = asyncio.run(scenario())
+    assert events[0].type == "resync"
+    assert events[0].sequence == 5
+
+
+def test_slow_consumer_is_dropped_and_stream_ends():
+    async def scenario():
+        broker = TaskEventBroker(queue_size=2)
+        subscription = broker.subscribe(1)
+        for task_id in range(1, 5):
+            broker.publish(1, "task.updated", {"id": task_id})
+        await asyncio.sleep(0)
+        events = [event async for event in broker.stream(subscription)]
+        return subscription, events, broker.subscriber_count(1)
+
+    subscription, events, remaining = asyncio.run(scenario())
+    assert subscription.overflowed
+    assert events == []
+    assert remaining == 0
+
+
+def test_event_formats_as_sse():
+    broker = TaskEventBroker()
+    event = broker.publish(3, "task.deleted", {"id": 7})
+    assert event.id == f"{event.generation}-1"
+    assert event.to_sse() == (
+        f'id: {event.id}\nevent: task.deleted\ndata: {{"id":7}}\n\n'
+    )
+
+
+def test_ids_from_another_history_request_resync():
+    async def scenario():
+        earlier = TaskEventBroker().publish(1, "task.created", {"id": 1})
+        broker = TaskEventBroker()
+        for task_id in range(3):
+            broker.publish(1, "task.created", {"id": task_id})
+        resyncs = []
+        for last_event_id in (earlier.id, "garbage", f"{earlier.generation}-x"):
+            subscription = broker.subscribe(1, last_event_id=last_event_id)
+            resyncs.extend(await _collect(broker, subscription, 1))
+        return resyncs
+
+    events = asyncio.run(scenario())
+    assert [(e.type, e.sequence) for e in events] == [("resync", 3)] * 3
+
+
+def test_idle_lists_are_evicted_and_deleted_lists_forgotten():
+    async def scenario():
+        broker = TaskEventBroker(max_lists=2)
+        followed = broker.subscribe(1)
+        stale = broker.publish(2, "task.created", {"id": 1})
+        broker.publish(3, "task.created", {"id": 2})
+        assert set(broker._logs) == {1, 3}
+
+        # A new history for list 2: the old id must not replay its events
+        broker.publish(2, "task.created", {"id": 3})
+        broker.publish(2, "task.created", {"id": 4})
+        resumed = broker.subscribe(2, last_event_id=stale.id)
+        events = await _collect(broker, resumed, 1)
+        broker.unsubscribe(resumed)
+
+        broker.forget(1)
+        broker.unsubscribe(followed)
+        return events, set(broker._logs)
+
+    events, remaining = asyncio.run(scenario())
+    assert [(e.type, e.sequence) for e in events] == [("resync", 2)]
+    assert remaining == {2}
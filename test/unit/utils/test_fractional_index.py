@@ -0,0 +1,54 @@
+import random
+import pytest
+from utils.fractional_index import evenly_spaced_keys, key_between
+
+
+def test_keys_between_neighbours_stay_ordered():
+    rng = random.Random(7)
+    keys = []
+    for _ in range(2000):
+        position = rng.randint(0, len(keys))
+        lower = keys[position - 1] if position else None
+        upper = keys[position] if position < len(keys) else None
+        key = key_between(lower, upper)
+        assert lower is None or lower < key
+        assert upper is None or key < upper
+        assert not key.endswith("0")
+        keys.insert(position, key)
+    assert max(len(key) for key in keys) <= 8
+
+
+@pytest.mark.parametrize("end", ["append", "prepend"])
+def test_keys_added_at_either_end_stay_short(end):
+    key = None
+    for _ in range(5000):
+        key = key_between(key, None) if end == "append" else key_between(None, key)
+    assert len(key) == 3
+
+
+def test_very_long_keys_still_extend():
+    assert key_between("z" * 3000, None) == "z" * 3000 + "1"
+    assert key_between(None, "0" * 3000 + "1") == "0" * 3001 + "z"
+
+
+def test_key_between_rejects_unordered_bounds():
+    with pytest.raises(ValueError):
+        key_between("k", "k")
+    with pytest.raises(ValueError):
+        key_between("k", "a")
+
+
+@pytest.mark.parametrize("count", [0, 1, 35, 36, 5000])
+def test_evenly_spaced_keys_are_ordered_and_distinct(count):
+    keys = evenly_spaced_keys(count)
+    assert keys == sorted(set(keys))
+    assert len(keys) == count
+    assert all(key and not key.endswith("0") for key in keys)
+
+
+@pytest.mark.parametrize("count, width", [(1, 2), (35, 2), (36, 3), (5000, 4)])
+def test_evenly_spaced_keys_leave_room_in_every_gap(count, width):
+    keys = evenly_spaced_keys(count)
+    assert max(map(len, keys)) <= width
+    for lower, upper in zip(keys, keys[1:]):
+        assert len(key_between(lower, upper)) <= width
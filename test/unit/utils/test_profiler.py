@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from utils.profiler import ProfileStore, ProfilingMiddleware, RequestProfile
+
+
+def _work(n):
+    return sum(_square(i) for i in range(n))
+
+
+def _square(i):
+    return i * i
+
+
+def test_request_profile_records_call_stacks():
+    profile = RequestProfile()
+    assert profile.run("endpoint", _work, 200) == sum(i * i for i in range(200))
+    profile.finish()
+
+    stacks = profile.collapsed().splitlines()
+    assert stacks
+    assert all(
+        line.startswith("endpoint;") or line.startswith("endpoint ") for line in stacks
+    )
+    assert any(f"{__name__}._work;" in line and "._square" in line for line in stacks)
+
+    top = {entry["function"]: entry for entry in profile.top_functions()}
+    assert top["endpoint"]["total_ms"] >= top[f"{__name__}._work"]["total_ms"]
+
+
+def test_profile_store_keeps_only_the_newest_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    ids = [store.save({"path": f"/{n}"}) for n in range(3)]
+
+    assert [summary["id"] for summary in store.summaries()] == ids[:0:-1]
+    assert store.get(ids[-1])["path"] == "/2"
+
+
+def test_profile_store_rejects_unknown_ids(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    for profile_id in ("../secret", "1-deadbeef"):
+        with pytest.raises(HTTPException) as error:
+            store.path(profile_id)
+        assert error.value.status_code == 404
+
+
+def test_middleware_saves_profiles_off_the_event_loop(tmp_path):
+    class RecordingStore(ProfileStore):
+        def save(self, profile, profile_id=None):
+            self.thread = threading.current_thread()
+            return super().save(profile, profile_id)
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    store = RecordingStore(str(tmp_path))
+    middleware = ProfilingMiddleware(endpoint, store=store, sample_rate=1)
+    scope = {"type": "http", "method": "GET", "path": "/x", "headers": []}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, None, send))
+
+    assert store.thread is not threading.main_thread()
+    profile_id = dict(sent[0]["headers"])[b"x-profile-id"].decode()
+    assert store.get(profile_id)["status_code"] == 204
@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from utils.jwt_handler import (
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+    get_revocable_claims,
+)
+from utils.revocation import RevocationCache, revocation_cache
+
+
+@pytest.fixture
+def clean_cache():
+    yield revocation_cache
+    revocation_cache._revoked = {}
+
+
+def test_refresh_drops_expired_revocations():
+    now = time.time()
+    cache = RevocationCache()
+    cache._loader = lambda: {"live": now + 60, "expired": now - 1}
+
+    assert cache.refresh() == 1
+    assert cache.is_revoked("live")
+    assert not cache.is_revoked("expired")
+
+
+def test_refresh_keeps_revocations_added_while_loading():
+    cache = RevocationCache()
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        loading.set()
+        release.wait(1)
+        return {}
+
+    cache._loader = slow_loader
+    worker = threading.Thread(target=cache.refresh)
+    worker.start()
+    loading.wait(1)
+    cache.add("local", time.time() + 60)
+    release.set()
+    worker.join()
+
+    assert cache.is_revoked("local")
+
+
+def test_failed_refresh_keeps_the_last_set():
+    cache = RevocationCache()
+    cache.add("kept", time.time() + 60)
+
+    def broken_loader():
+        raise RuntimeError("database down")
+
+    cache._loader = broken_loader
+    with pytest.raises(RuntimeError):
+        cache.refresh()
+    assert cache.is_revoked("kept")
+
+
+def test_revoked_token_is_rejected(clean_cache):
+    token = create_access_token({"sub": "alice"})
+    assert get_current_user(token) == {"username": "alice"}
+
+    jti, expires_at = get_revocable_claims(token)
+    clean_cache.add(jti, expires_at)
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token)
+    assert exc.value.status_code == 401
+    assert get_current_user(create_access_token({"sub": "alice"}))
+
+
+def test_tokens_get_unique_ids():
+    first = decode_access_token(create_access_token({"sub": "alice"}))
+    second = decode_access_token(create_access_token({"sub": "alice"}))
+    assert first["jti"] != second["jti"]
+
+
+def test_invalid_token_cannot_be_revoked():
+    with pytest.raises(HTTPException) as exc:
+        get_revocable_claims("not-a-token")
+    assert exc.value.status_code == 400
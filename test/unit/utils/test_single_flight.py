@@ -0,0 +1,99 @@
+import threading
+import pytest
+from utils.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, func, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, func))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(1)
+        return b"tasks"
+
+    threading.Timer(0.2, release.set).start()
+    results, errors = _run_concurrently(flight, ("list_tasks", 1), load, 10)
+
+    assert results == [b"tasks"] * 10 and not errors
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert stats["leaders"] == 1 and stats["followers"] == 9
+    assert stats["coalescing_ratio"] == pytest.approx(0.9)
+    assert stats["in_flight"] == 0
+
+
+def test_leader_error_is_raised_by_every_caller():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def load():
+        release.wait(1)
+        raise LookupError("list not found")
+
+    threading.Timer(0.2, release.set).start()
+    results, errors = _run_concurrently(flight, "key", load, 5)
+
+    assert not results
+    assert len(errors) == 5 and all(isinstance(e, LookupError) for e in errors)
+    assert flight.stats()["errors"] == 1
+
+
+def test_follower_runs_the_call_itself_after_the_timeout():
+    flight = SingleFlight(timeout=0.05)
+    leader_started, release = threading.Event(), threading.Event()
+
+    def slow():
+        leader_started.set()
+        release.wait(2)
+        return "leader"
+
+    leader = threading.Thread(target=flight.do, args=("key", slow))
+    leader.start()
+    leader_started.wait(1)
+    assert flight.do("key", lambda: "follower") == "follower"
+    release.set()
+    leader.join()
+    assert flight.stats()["timeouts"] == 1
+
+
+def test_invalidate_starts_a_new_call_for_later_callers():
+    flight = SingleFlight(timeout=5)
+    leader_started, release = threading.Event(), threading.Event()
+
+    def stale():
+        leader_started.set()
+        release.wait(2)
+        return "stale"
+
+    leader = threading.Thread(target=flight.do, args=("key", stale))
+    leader.start()
+    leader_started.wait(1)
+    flight.invalidate()
+    assert flight.do("key", lambda: "fresh") == "fresh"
+    release.set()
+    leader.join()
+
+
+def test_disabled_flight_calls_through():
+    flight = SingleFlight(enabled=False)
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.stats()["leaders"] == 0
@@ -0,0 +1,67 @@
+from utils import tracing
+from utils.tracing import Tracer, traced, _current_span
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def test_unsampled_request_creates_no_span():
+    tracer = Tracer(MemoryExporter(), sample_rate=0)
+    assert tracer.start_root_span("GET /") is None
+
+
+def test_incoming_traceparent_is_continued():
+    tracer = Tracer(MemoryExporter(), sample_rate=0)
+    span = tracer.start_root_span(
+        "GET /", "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    )
+    assert span.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert span.parent_id == "b7ad6b7169203331"
+
+
+def test_incoming_unsampled_traceparent_is_respected():
+    tracer = Tracer(MemoryExporter(), sample_rate=1)
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00"
+    assert tracer.start_root_span("GET /", traceparent) is None
+
+
+def test_traced_records_nested_spans(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracing, "tracer", Tracer(exporter, sample_rate=1))
+
+    @traced("inner")
+    def inner():
+        return "ok"
+
+    @traced("outer")
+    def outer():
+        return inner()
+
+    root = tracing.tracer.start_root_span("GET /")
+    token = _current_span.set(root)
+    try:
+        assert outer() == "ok"
+    finally:
+        _current_span.reset(token)
+
+    inner_span, outer_span = exporter.spans
+    assert (inner_span.name, outer_span.name) == ("inner", "outer")
+    assert inner_span.parent_id == outer_span.span_id
+    assert outer_span.parent_id == root.span_id
+
+
+def test_traced_is_a_passthrough_without_active_span(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracing, "tracer", Tracer(exporter, sample_rate=1))
+
+    @traced()
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert exporter.spans == []
@@ -0,0 +1,105 @@
+"""
+Fractional indexing: string keys that sort in the order of the items they
+label, with room for a new key between any two of them.
+
+A key is a base 36 fraction (``"i"`` is 18/36, ``"i8"`` is 18/36 + 8/36²).
+Only digits and lowercase letters are used, so keys sort the same way under
+binary and case-insensitive collations. Keys never end in ``"0"``, which
+keeps a free key between any two distinct keys.
+"""
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+# Keys added at either end step by 1/36**3: about 23k fit on each side of "i",
+# then each extra character only holds 35 more
+APPEND_WIDTH = 3
+
+
+def key_between(lower: str | None, upper: str | None) -> str:
+    """
+    Return a key that sorts strictly between two keys.
+
+    Args:
+        lower (str | None): Key to sort after, None for the start.
+        upper (str | None): Key to sort before, None for the end.
+
+    Returns:
+        str: The new key. Keys added at either end stay three characters
+        long for about 23k keys on each side of the first one, then grow by
+        one character every 35 keys; inserting repeatedly into the same gap
+        adds about one character every five inserts. Rebalancing with
+        ``evenly_spaced_keys`` makes them short again.
+
+    Raises:
+        ValueError: If ``lower`` does not sort before ``upper``.
+    """
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"{lower!r} does not sort before {upper!r}")
+    if lower is None and upper is None:
+        return _midpoint("", "")
+    if upper is None:
+        return _increment(lower)
+    if lower is None:
+        return _decrement(upper)
+    return _midpoint(lower, upper)
+
+
+def evenly_spaced_keys(count: int) -> list[str]:
+    """
+    Return ``count`` increasing keys, spread evenly.
+
+    Keys get one digit more than needed to tell them apart, so every gap
+    holds at least 35 more keys without using more digits.
+    """
+    width = 2
+    while BASE ** (width - 1) <= count:
+        width += 1
+    step = BASE**width // (count + 1)
+    return [_to_key((index + 1) * step, width) for index in range(count)]
+
+
+def _increment(key: str, width: int = APPEND_WIDTH) -> str:
+    """Smallest key of ``width`` digits above ``key``, widened if there is none."""
+    while True:
+        value = int(key[:width].ljust(width, "0"), BASE) + 1
+        if value < BASE**width:
+            return _to_key(value, width)
+        width += 1
+
+
+def _decrement(key: str, width: int = APPEND_WIDTH) -> str:
+    """Largest key of ``width`` digits below ``key``, widened if there is none."""
+    while True:
+        if len(key) > width:
+            lower = key[:width].rstrip("0")
+        else:
+            value = int(key.ljust(width, "0"), BASE) - 1
+            lower = _to_key(value, width) if value > 0 else ""
+        if lower:
+            return lower
+        width += 1
+
+
+def _midpoint(lower: str, upper: str) -> str:
+    prefix = 0
+    while prefix < len(upper) and (lower[prefix : prefix + 1] or "0") == upper[prefix]:
+        prefix += 1
+    if prefix:
+        return upper[:prefix] + _midpoint(lower[prefix:], upper[prefix:])
+
+    low = DIGITS.index(lower[0]) if lower else 0
+    high = DIGITS.index(upper[0]) if upper else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    # Adjacent digits: extend the lower key
+    if len(upper) > 1:
+        return upper[0]
+    return DIGITS[low] + _midpoint(lower[1:], "")
+
+
+def _to_key(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
@@ -4,7 +4,10 @@ from datetime import datetime, timedelta, timezone
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 import jwt
+from uuid import uuid4
 from jwt import PyJWTError
+from utils.revocation import revocation_cache
+from utils.tracing import traced
 
 
 load_dotenv()
@@ -16,18 +19,34 @@ ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 if ACCESS_TOKEN_EXPIRE_MINUTES is None:
     raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES is not set")
 
-ACCESS_TOKEN_EXPIRE_MINUTES = int(ACCESS_TOKEN_EXPIRE_MINUTES) 
+ACCESS_TOKEN_EXPIRE_MINUTES = int(ACCESS_TOKEN_EXPIRE_MINUTES)
+
+ADMIN_USERNAMES = {
+    username.strip()
+    for username in os.getenv("ADMIN_USERNAMES", "").split(",")
+    if username.strip()
+}
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Raises:
+        PyJWTError: If the token is malformed, forged or expired.
+    """
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
 
+@traced("auth.get_current_user")
 def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,11 +54,50 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
+        # Tokens issued before revocation support have no jti
+        jti = payload.get("jti")
+        if jti is not None and revocation_cache.is_revoked(jti):
+            raise credentials_exception
         user = {"username": username}
     except PyJWTError:
         raise credentials_exception
     return user
+
+
+def get_revocable_claims(token: str) -> tuple[str, float]:
+    """
+    Return the ``jti`` and ``exp`` claims of a token to revoke.
+
+    Raises:
+        HTTPException (400): If the token is invalid, expired or has no ``jti``.
+    """
+    try:
+        payload = decode_access_token(token)
+    except PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired token",
+        )
+    if payload.get("jti") is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token has no ID and cannot be revoked",
+        )
+    return payload["jti"], payload["exp"]
+
+
+def is_admin(user: dict) -> bool:
+    return user.get("username") in ADMIN_USERNAMES
+
+
+def get_current_admin(user: dict = Depends(get_current_user)):
+    if not is_admin(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user
@@ -0,0 +1,297 @@
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.jwt_handler import get_current_user, is_admin
+
+load_dotenv()
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "30"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_RE = re.compile(r"^\d+-[0-9a-f]{8}$")
+
+_active_profile: ContextVar["RequestProfile | None"] = ContextVar(
+    "active_profile", default=None
+)
+
+
+class RequestProfile:
+    """
+    Deterministic call-stack profiler for one request.
+
+    Endpoints attach the thread they run on through ``ProfiledRoute``; a
+    ``sys.setprofile`` hook then charges the time between two call events
+    to the current stack, so the profile holds the exact self time of every
+    stack (in microseconds) and nothing from concurrent requests.
+    """
+
+    def __init__(self):
+        self._recorders: list[_StackRecorder] = []
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stacks: Counter = Counter()
+
+    def run(self, root: str, func, *args, **kwargs):
+        """Call ``func`` on the current thread, recording its call stacks."""
+        recorder = _StackRecorder(root)
+        with self._lock:
+            self._recorders.append(recorder)
+        sys.setprofile(recorder)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+            recorder.close()
+
+    def finish(self):
+        with self._lock:
+            for recorder in self._recorders:
+                for stack, elapsed_ns in recorder.self_ns.items():
+                    self.stacks[stack] += elapsed_ns // 1000
+            self._recorders = []
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        return "".join(
+            f"{stack} {micros}\n"
+            for stack, micros in self.stacks.most_common()
+            if micros
+        )
+
+    def top_functions(self, limit: int = PROFILE_TOP_N) -> list[dict]:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, micros in self.stacks.items():
+            functions = stack.split(";")
+            own[functions[-1]] += micros
+            for function in set(functions):
+                total[function] += micros
+        return [
+            {
+                "function": function,
+                "own_ms": round(own[function] / 1000, 3),
+                "total_ms": round(micros / 1000, 3),
+            }
+            for function, micros in total.most_common(limit)
+        ]
+
+
+class _StackRecorder:
+    __slots__ = ("keys", "last_ns", "self_ns")
+
+    def __init__(self, root: str):
+        self.keys = [root]
+        self.self_ns: Counter = Counter()
+        self.last_ns = time.perf_counter_ns()
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        self.self_ns[self.keys[-1]] += now - self.last_ns
+        if event == "call":
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            self.keys.append(f"{self.keys[-1]};{module}.{code.co_name}")
+        elif event == "c_call":
+            module = getattr(arg, "__module__", None) or "builtins"
+            name = getattr(arg, "__qualname__", getattr(arg, "__name__", "?"))
+            self.keys.append(f"{self.keys[-1]};{module}.{name}")
+        elif len(self.keys) > 1:
+            self.keys.pop()
+        self.last_ns = time.perf_counter_ns()
+
+    def close(self):
+        self.self_ns[self.keys[-1]] += time.perf_counter_ns() - self.last_ns
+
+
+def new_profile_id() -> str:
+    # Starts with a nanosecond timestamp, so name order is age order
+    return f"{time.time_ns()}-{random.getrandbits(32):08x}"
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of request profiles, oldest evicted first."""
+
+    def __init__(
+        self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES
+    ):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, profile: dict, profile_id: str | None = None) -> str:
+        profile_id = profile_id or new_profile_id()
+        profile = {"id": profile_id, **profile}
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile_id}.json").write_text(json.dumps(profile))
+            for stale in self._files()[: -self.max_files]:
+                stale.unlink(missing_ok=True)
+        return profile_id
+
+    def summaries(self) -> list[dict]:
+        summaries = []
+        for path in reversed(self._files()):
+            try:
+                profile = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            profile.pop("top", None)
+            profile.pop("collapsed", None)
+            summaries.append(profile)
+        return summaries
+
+    def path(self, profile_id: str) -> Path:
+        """
+        Raises:
+            HTTPException (404): If the profile does not exist (anymore).
+        """
+        path = self.directory / f"{profile_id}.json"
+        if not PROFILE_ID_RE.match(profile_id) or not path.is_file():
+            raise HTTPException(
+                status_code=404, detail=f"Profile {profile_id} not found"
+            )
+        return path
+
+    def get(self, profile_id: str) -> dict:
+        return json.loads(self.path(profile_id).read_text())
+
+    def _files(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.json"))
+
+
+profile_store = ProfileStore()
+
+
+def profiled_endpoint(func):
+    """Attach the thread running ``func`` to the active request profile."""
+    root = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        return profile.run(root, func, *args, **kwargs)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute whose endpoint can be profiled; a plain route when disabled.
+
+    Only sync endpoints are profiled: they run on a threadpool thread of
+    their own, while async ones share the event loop with other requests.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router() rebuilds routes from the already wrapped endpoint
+        if (
+            PROFILING_ENABLED
+            and not inspect.iscoroutinefunction(endpoint)
+            and not getattr(endpoint, "__profiled__", False)
+        ):
+            endpoint = profiled_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _requested_by_admin(headers: Headers) -> bool:
+    if headers.get(PROFILE_HEADER, "").lower() not in ("1", "true"):
+        return False
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        return is_admin(get_current_user(token))
+    except HTTPException:
+        return False
+
+
+class ProfilingMiddleware:
+    """
+    Profile a request when an admin sends ``X-Profile: 1`` or when it is
+    picked by ``PROFILE_SAMPLE_RATE``. The profile ID is returned in the
+    ``X-Profile-Id`` response header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (
+            _requested_by_admin(Headers(scope=scope))
+            or random.random() < self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        status_code = None
+        # Reserved up front so it can be sent before the profile is saved
+        profile_id = new_profile_id()
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        token = _active_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _active_profile.reset(token)
+            profile.finish()
+            duration_ms = round((time.time() - profile.started) * 1000, 2)
+
+            def save():
+                self.store.save(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "created_at": profile.started,
+                        "duration_ms": duration_ms,
+                        "profiled_ms": round(sum(profile.stacks.values()) / 1000, 2),
+                        "top": profile.top_functions(),
+                        "collapsed": profile.collapsed(),
+                    },
+                    profile_id=profile_id,
+                )
+
+            # Serializing and writing the file would block every other request
+            await run_in_threadpool(save)
@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+
+
+class RevocationCache:
+    """
+    In-memory set of revoked token IDs (``jti``), checked on every request.
+
+    The set only holds revocations whose token has not expired yet, so it
+    stays as small as the number of live revoked tokens. A background
+    thread reloads it from the store every ``interval`` seconds and swaps
+    it in one assignment; revocations made by this process are visible at
+    once, those of other processes after at most one interval.
+    """
+
+    def __init__(self, interval: float = REVOCATION_REFRESH_SECONDS):
+        self.interval = interval
+        self._revoked: dict[str, float] = {}
+        self._added_during_refresh: dict[str, float] | None = None
+        self._loader: Callable[[], dict[str, float]] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._revoked[jti] = expires_at
+            if self._added_during_refresh is not None:
+                self._added_during_refresh[jti] = expires_at
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def refresh(self) -> int:
+        """
+        Replace the set with the live revocations returned by the loader.
+
+        Returns:
+            int: Number of revoked tokens now in the set.
+        """
+        with self._lock:
+            self._added_during_refresh = {}
+        try:
+            revoked = self._loader()
+        except Exception:
+            with self._lock:
+                self._added_during_refresh = None
+            raise
+        now = time.time()
+        with self._lock:
+            # Keep what this process revoked while the store was being read
+            revoked.update(self._added_during_refresh)
+            self._added_during_refresh = None
+            self._revoked = {jti: exp for jti, exp in revoked.items() if exp > now}
+            return len(self._revoked)
+
+    def start(self, loader: Callable[[], dict[str, float]]):
+        """Load the revocations once, then keep them fresh in the background."""
+        self._loader = loader
+        self.refresh()
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, name="revocation-refresh", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Revocation refresh failed, keeping the last set")
+
+
+revocation_cache = RevocationCache()
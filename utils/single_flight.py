@@ -0,0 +1,107 @@
+import os
+import threading
+from collections.abc import Callable, Hashable
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SINGLE_FLIGHT_TIMEOUT_SECONDS = float(os.getenv("SINGLE_FLIGHT_TIMEOUT_SECONDS", "5"))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one.
+
+    The first caller of a key (the leader) runs the function; callers that
+    arrive with the same key while it runs (the followers) wait for it and
+    get the same result, or the same exception. A follower that waits longer
+    than ``timeout`` seconds gives up and runs the function itself.
+
+    Only calls that overlap are shared: nothing is cached once the leader
+    returns, and ``invalidate`` makes later callers start a fresh call.
+    """
+
+    def __init__(
+        self,
+        timeout: float = SINGLE_FLIGHT_TIMEOUT_SECONDS,
+        enabled: bool = SINGLE_FLIGHT_ENABLED,
+    ):
+        self.timeout = timeout
+        self.enabled = enabled
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, func: Callable):
+        if not self.enabled:
+            return func()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.errors += 1
+                raise
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            return func()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def invalidate(self):
+        """Make later callers start new calls instead of joining running ones."""
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.leaders + self.followers
+            return {
+                "enabled": self.enabled,
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "coalescing_ratio": self.followers / requests if requests else 0.0,
+            }
+
+
+read_single_flight = SingleFlight()
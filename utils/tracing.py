@@ -0,0 +1,341 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT")
+TRACE_EXPORT_INTERVAL_SECONDS = float(os.getenv("TRACE_EXPORT_INTERVAL_SECONDS", "2"))
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "task-tracking-api")
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None = None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes: dict = {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class SpanExporter:
+    """
+    Buffers finished spans and writes them from a background thread.
+
+    Each flush appends one OTLP/JSON ``ExportTraceServiceRequest`` line to
+    ``path`` (the format read by the collector's ``otlpjsonfile`` receiver)
+    and, when ``endpoint`` is set, posts it to an OTLP/HTTP collector.
+    """
+
+    def __init__(
+        self,
+        path: str | None = TRACE_EXPORT_PATH,
+        endpoint: str | None = TRACE_OTLP_ENDPOINT,
+        interval: float = TRACE_EXPORT_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self.endpoint = endpoint
+        self.interval = interval
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="span-exporter", daemon=True
+                )
+                self._worker.start()
+
+    def flush(self):
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": TRACE_SERVICE_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as export_file:
+                export_file.write(json.dumps(request, separators=(",", ":")) + "\n")
+        if self.endpoint:
+            import httpx
+
+            httpx.post(self.endpoint, json=request, timeout=5)
+
+    def shutdown(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Span export failed")
+
+
+class Tracer:
+    """
+    Minimal W3C trace-context tracer.
+
+    The sampling decision is taken once per request; unsampled requests never
+    create a span, so instrumented code only pays for a context variable
+    lookup.
+    """
+
+    def __init__(self, exporter: SpanExporter, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start_root_span(self, name: str, traceparent: str | None = None):
+        """
+        Start the span of an incoming request, or return None if unsampled.
+
+        A valid ``traceparent`` continues the caller's trace and keeps its
+        sampling decision; otherwise ``sample_rate`` decides.
+        """
+        match = TRACEPARENT_RE.match(traceparent or "")
+        if match:
+            trace_id, parent_id, flags = match.groups()
+            if not int(flags, 16) & 1:
+                return None
+            return Span(name, trace_id, parent_id)
+        if random.random() >= self.sample_rate:
+            return None
+        return Span(name, f"{random.getrandbits(128):032x}")
+
+    def start_span(self, name: str) -> Span | None:
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(name, parent.trace_id, parent.span_id)
+
+    def end_span(self, span: Span, error: BaseException | None = None):
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    def span(self, name: str):
+        return _SpanScope(self, name)
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+class _SpanScope:
+    __slots__ = ("tracer", "name", "span", "token")
+
+    def __init__(self, tracer: Tracer, name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> Span | None:
+        self.span = self.tracer.start_span(self.name)
+        if self.span is not None:
+            self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.span is not None:
+            _current_span.reset(self.token)
+            self.tracer.end_span(self.span, exc)
+        return False
+
+
+tracer = Tracer(SpanExporter())
+
+
+def traced(name: str | None = None):
+    """
+    Record a child span around every call of the decorated function.
+
+    Works on plain and async functions and keeps the signature intact, so
+    it can wrap FastAPI endpoints and dependencies.
+    """
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """Open the root span of each sampled HTTP request."""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        span = self.tracer.start_root_span(
+            f"{scope['method']} {scope['path']}",
+            Headers(scope=scope).get("traceparent"),
+        )
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+                MutableHeaders(scope=message)["traceresponse"] = span.traceparent
+            await send(message)
+
+        span.attributes["http.method"] = scope["method"]
+        span.attributes["http.target"] = scope["path"]
+        token = _current_span.set(span)
+        error = None
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{scope['method']} {route.path}"
+            self.tracer.end_span(span, error)
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse that records JSON encoding as its own span."""
+
+    def render(self, content) -> bytes:
+        with tracer.span("http.response.render"):
+            return super().render(content)
+
+
+def instrument_engine(engine, tracer: Tracer = tracer):
+    """Record a span for every SQL statement executed by ``engine``."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_span(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query")
+        if span is not None:
+            span.attributes["db.system"] = conn.dialect.name
+            span.attributes["db.statement"] = statement[:500]
+        context._trace_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_query_span(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.attributes["db.rows"] = cursor.rowcount
+            tracer.end_span(span)
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def fail_query_span(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None) if context else None
+        if span is not None:
+            tracer.end_span(span, exception_context.original_exception)
+            context._trace_span = None